@@ -14,11 +14,13 @@ export async function GET() {
     }
 
     const files = await fs.readdir(modelsDir)
-    // Filter for .joblib files that represent algorithms (exclude scaler/encoders)
-    const algorithms = files
-      .filter(f => f.endsWith('.joblib'))
-      .filter(f => !['scaler.joblib', 'label_encoder.joblib', 'column_encoders.joblib'].includes(f))
-      .map(f => f.replace('.joblib', ''))
+    // Filter for .joblib files (or native XGBoost .ubj boosters) that represent algorithms
+    // (exclude preprocessors, SHAP explainers and files still being written)
+    const algorithms = Array.from(new Set(files
+      .filter(f => (f.endsWith('.joblib') || f.endsWith('.ubj')) && !f.endsWith('.explainer.joblib'))
+      .filter(f => !f.includes('.tmp.'))
+      .filter(f => !['preprocessor.joblib', 'scaler.joblib', 'label_encoder.joblib', 'column_encoders.joblib'].includes(f))
+      .map(f => f.replace(/\.(joblib|ubj)$/, ''))))
 
     return NextResponse.json({
       available: algorithms.length > 0,
@@ -8,14 +8,43 @@ import os from "os"
 
 const execFileAsync = promisify(execFile)
 
+// A running but stuck prediction server must not hang the request: give up and use the CLI
+const PREDICTION_SERVER_TIMEOUT_MS = Number(process.env.PREDICTION_SERVER_TIMEOUT_MS) || 30000
+
 export async function POST(request: NextRequest) {
   try {
-    const { participant_data, trained_models, csv_data } = await request.json()
+    const { participant_data, trained_models, csv_data, explain } = await request.json()
 
     if ((!participant_data && !csv_data) || !trained_models || trained_models.length === 0) {
       return NextResponse.json({ error: "Missing data" }, { status: 400 })
     }
 
+    // Prefer the warm prediction server (scripts/prediction_server.py) when configured
+    const serverUrl = process.env.PREDICTION_SERVER_URL
+    if (serverUrl) {
+      try {
+        const res = await fetch(`${serverUrl.replace(/\/$/, "")}/predict`, {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ participant_data, trained_models, csv_data, explain: Boolean(explain) }),
+          signal: AbortSignal.timeout(PREDICTION_SERVER_TIMEOUT_MS),
+        })
+        const result = await res.json()
+        if (result.error) {
+          throw new Error(result.error)
+        }
+        return NextResponse.json(result)
+      } catch (serverErr) {
+        // ignore (unreachable, error or timed out); fall back to spawning the predictor CLI below
+        const timedOut = serverErr instanceof Error && (serverErr.name === "TimeoutError" || serverErr.name === "AbortError")
+        if (timedOut) {
+          console.warn(`[predict] prediction server did not answer within ${PREDICTION_SERVER_TIMEOUT_MS} ms, using CLI`)
+        } else {
+          console.warn("[predict] prediction server unavailable, using CLI:", serverErr)
+        }
+      }
+    }
+
     const projectRoot = process.cwd()
     const scriptPath = path.join(projectRoot, "scripts", "run_predictor.py")
 
@@ -42,6 +71,10 @@ export async function POST(request: NextRequest) {
       "--models", trained_models.join(","),
       "--models_dir", path.join(projectRoot, "saved_models")
     ]
+    if (explain) {
+      // Per-feature SHAP contributions from the explainers saved at training time
+      args.push("--explain")
+    }
 
     let tempFile = ""
 
@@ -437,7 +437,9 @@ export default function ResultsSummary({
                     <th className='text-left p-2'>Comparison</th>
                     <th className='text-left p-2'>Statistic</th>
                     <th className='text-left p-2'>p-value</th>
+                    <th className='text-left p-2'>Adjusted p</th>
                     <th className='text-left p-2'>Significant</th>
+                    <th className='text-left p-2'>Significant (adjusted)</th>
                   </tr>
                 </thead>
                 <tbody>
@@ -450,9 +452,19 @@ export default function ResultsSummary({
                         {format(v.mcnemar_test.statistic)}
                       </td>
                       <td className='p-2'>{format(v.mcnemar_test.p_value)}</td>
+                      <td className='p-2'>
+                        {v.mcnemar_test.p_value_adjusted !== undefined
+                          ? `${format(v.mcnemar_test.p_value_adjusted)} (${v.mcnemar_test.adjustment})`
+                          : '-'}
+                      </td>
                       <td className='p-2'>
                         {v.mcnemar_test.significant ? 'Yes' : 'No'}
                       </td>
+                      <td className='p-2'>
+                        {v.mcnemar_test.significant_adjusted === undefined
+                          ? '-'
+                          : v.mcnemar_test.significant_adjusted ? 'Yes' : 'No'}
+                      </td>
                     </tr>
                   ))}
                 </tbody>
@@ -15,7 +15,11 @@ export interface AlgorithmResult {
   best_params?: any
   validation_score?: number
   feature_importance?: { [key: string]: number }
+  // Why feature_importance is empty (models without per-feature importances)
+  feature_importance_note?: string
   shap_importance?: { [key: string]: number }
+  // 95% percentile bootstrap intervals over the test set
+  metrics_ci?: { [metric: string]: { lower: number; upper: number } } | null
   cv_stats?: {
     mean_f1: number
     std_f1: number
@@ -32,7 +36,11 @@ export interface StatisticalAnalysisItem {
   mcnemar_test: {
     statistic: number
     p_value: number
+    p_value_adjusted?: number
+    adjustment?: string
+    // significant: raw p_value < 0.05; significant_adjusted: p_value_adjusted < 0.05
     significant: boolean
+    significant_adjusted?: boolean
     contingency: any
   }
 }
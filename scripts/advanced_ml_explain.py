@@ -0,0 +1,214 @@
+"""
+SHAP explanation engine for the trained bootcamp models.
+
+Picks the cheapest explainer that is exact for each algorithm:
+  decision_tree, xgboost -> TreeExplainer (exact tree SHAP)
+  adaboost               -> TreeExplainer over the SAMME stumps (exact, decision-function scale)
+  logistic               -> LinearExplainer (closed form, log-odds scale)
+  knn, svm               -> KernelExplainer on a k-means summarized background
+Rows are explained in chunks, optionally on several workers. shap is imported
+lazily so importing this module stays cheap.
+
+Training also saves each model's explainer as <alg_id>.explainer.joblib next to
+<alg_id>.joblib so prediction can return per-row contributions without
+rebuilding it (see make_explainer_artifact / explain_matrix).
+"""
+import time
+import warnings
+
+import numpy as np
+
+# Sample budgets; override any of them per training run. Kernel SHAP costs about
+# rows x background centres x coalitions model evaluations, so it gets its own small row budget
+SHAP_BUDGETS = {
+    'explain_rows': 100,        # rows explained per model by the exact tree/linear explainers
+    'kernel_explain_rows': 20,  # rows explained per model by KernelExplainer (KNN, SVM)
+    'background_rows': 10,      # k-means centres summarizing the training data for kernel models
+    'linear_background_rows': 200,  # training rows whose mean/variance the LinearExplainer uses
+    'kernel_nsamples': 100,     # coalitions per row for KernelExplainer (all 62 of the 6 features fit)
+    'chunk_rows': 25,           # rows per explanation chunk
+    'n_jobs': 1                 # workers for the chunks (-1 = all cores)
+}
+
+TREE_EXPLAINER_ALGORITHMS = ('decision_tree', 'xgboost', 'adaboost')
+LINEAR_EXPLAINER_ALGORITHMS = ('logistic',)
+
+# Units the contributions are in (base_value + sum of contributions = model output on this scale)
+EXPLANATION_SCALES = {
+    'logistic': 'log_odds',
+    'xgboost': 'log_odds',
+    'adaboost': 'decision_function',
+    'decision_tree': 'probability',
+    'knn': 'probability',
+    'svm': 'probability'
+}
+
+EXPLAINER_VERSION = 1
+EXPLAINER_SUFFIX = '.explainer.joblib'
+
+
+def explainer_filename(alg_id):
+    return f'{alg_id}{EXPLAINER_SUFFIX}'
+
+
+def _adaboost_tree_ensemble(model):
+    """
+    Express a binary SAMME AdaBoostClassifier as a custom tree ensemble for TreeExplainer.
+    Its decision_function is 2/sum(w) * sum_i w_i * (+1 if tree i predicts the positive class else -1),
+    so every stump becomes a tree whose leaves hold that term and SHAP values add up exactly.
+    """
+    if len(model.classes_) != 2:
+        raise ValueError("AdaBoost tree explanations support binary classification only")
+    weights = model.estimator_weights_[:len(model.estimators_)]
+    total_weight = weights.sum()
+    trees = []
+    for estimator, weight in zip(model.estimators_, weights):
+        tree = estimator.tree_
+        node_class = estimator.classes_[tree.value[:, 0, :].argmax(axis=1)]
+        values = (2.0 * weight / total_weight) * np.where(node_class == model.classes_[1], 1.0, -1.0)
+        node_weight = tree.weighted_n_node_samples.astype(float)
+        # Internal nodes hold the sample-weighted mean of their children (children have higher ids)
+        for node in range(tree.node_count - 1, -1, -1):
+            left, right = tree.children_left[node], tree.children_right[node]
+            if left != -1:
+                values[node] = (values[left] * node_weight[left] + values[right] * node_weight[right]) / node_weight[node]
+        trees.append({
+            'children_left': tree.children_left,
+            'children_right': tree.children_right,
+            'children_default': tree.children_left,
+            'features': tree.feature,
+            'thresholds': tree.threshold,
+            'values': values.reshape(-1, 1),
+            'node_sample_weight': node_weight
+        })
+    return {'trees': trees}
+
+
+def build_explainer(model, algorithm_id, X_background, budgets=None):
+    """Create the explainer for algorithm_id; X_background is (scaled) training data"""
+    import shap
+
+    budgets = dict(SHAP_BUDGETS, **(budgets or {}))
+    if algorithm_id == 'adaboost':
+        return shap.TreeExplainer(_adaboost_tree_ensemble(model))
+    if algorithm_id in TREE_EXPLAINER_ALGORITHMS:
+        return shap.TreeExplainer(model)
+    if algorithm_id in LINEAR_EXPLAINER_ALGORITHMS:
+        background = X_background[:budgets['linear_background_rows']]
+        return shap.LinearExplainer(model, shap.maskers.Independent(background, max_samples=len(background)))
+    n_centres = min(budgets['background_rows'], len(X_background))
+    return shap.KernelExplainer(model.predict_proba, shap.kmeans(X_background, n_centres))
+
+
+def explainer_kind(explainer):
+    return type(explainer).__name__
+
+
+def positive_class_values(shap_values):
+    """
+    Reduce shap output to (rows, features) for the positive class. Depending on the
+    explainer and shap version it is a list per class, a (rows, features, classes)
+    array or already (rows, features).
+    """
+    if isinstance(shap_values, list):
+        shap_values = shap_values[-1]
+    shap_values = np.asarray(shap_values)
+    if shap_values.ndim == 3:
+        shap_values = shap_values[:, :, -1]
+    return shap_values
+
+
+def positive_class_base(expected_value):
+    """Scalar base value for the positive class (explainers report one per class or a single one)"""
+    return float(np.ravel(expected_value)[-1])
+
+
+def make_explainer_artifact(model, algorithm_id, X_background, feature_names, budgets=None):
+    """Everything prediction needs to explain rows of a saved model, ready for joblib.dump"""
+    budgets = dict(SHAP_BUDGETS, **(budgets or {}))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        explainer = build_explainer(model, algorithm_id, X_background, budgets)
+    return {
+        'version': EXPLAINER_VERSION,
+        'algorithm_id': algorithm_id,
+        'explainer': explainer,
+        'scale': EXPLANATION_SCALES.get(algorithm_id, 'probability'),
+        'feature_names': list(feature_names),
+        'kernel_nsamples': budgets['kernel_nsamples']
+    }
+
+
+def explain_matrix(artifact, X, chunk_rows=None, n_jobs=1):
+    """
+    Per-row contributions from a saved explainer artifact.
+    Returns {'base_value', 'scale', 'feature_names', 'values' (rows, features) array}.
+    """
+    if artifact.get('version') != EXPLAINER_VERSION:
+        raise ValueError(f"Unsupported explainer version {artifact.get('version')} (expected {EXPLAINER_VERSION}); please retrain")
+    budgets = {'kernel_nsamples': artifact['kernel_nsamples'], 'n_jobs': n_jobs}
+    if chunk_rows:
+        budgets['chunk_rows'] = chunk_rows
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        values = explain_rows(artifact['explainer'], X, budgets)
+    return {
+        'base_value': positive_class_base(artifact['explainer'].expected_value),
+        'scale': artifact['scale'],
+        'feature_names': artifact['feature_names'],
+        'values': values
+    }
+
+
+def _explain_chunk(explainer, X_chunk, kernel_nsamples):
+    if explainer_kind(explainer) == 'KernelExplainer':
+        values = explainer.shap_values(X_chunk, nsamples=kernel_nsamples, silent=True)
+    else:
+        values = explainer.shap_values(X_chunk)
+    return positive_class_values(values)
+
+
+def explain_rows(explainer, X, budgets=None):
+    """SHAP values (rows, features) for every row of X, computed chunk by chunk"""
+    budgets = dict(SHAP_BUDGETS, **(budgets or {}))
+    chunk_rows = max(1, int(budgets['chunk_rows']))
+    chunks = [X[start:start + chunk_rows] for start in range(0, len(X), chunk_rows)]
+    if budgets['n_jobs'] == 1 or len(chunks) <= 1:
+        parts = [_explain_chunk(explainer, chunk, budgets['kernel_nsamples']) for chunk in chunks]
+    else:
+        from joblib import Parallel, delayed
+        parts = Parallel(n_jobs=budgets['n_jobs'])(
+            delayed(_explain_chunk)(explainer, chunk, budgets['kernel_nsamples']) for chunk in chunks
+        )
+    return np.vstack(parts) if parts else np.zeros((0, X.shape[1]))
+
+
+def shap_importance(model, algorithm_id, X_explain, X_background, feature_names, budgets=None):
+    """
+    Mean |SHAP| per feature over up to budgets['explain_rows'] rows of X_explain
+    (budgets['kernel_explain_rows'] for KernelExplainer). Returns (importance sorted high to low, stats with explainer, row counts and seconds).
+    Errors are raised; the caller decides how to report them.
+    """
+    budgets = dict(SHAP_BUDGETS, **(budgets or {}))
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        explainer = build_explainer(model, algorithm_id, X_background, budgets)
+        kind = explainer_kind(explainer)
+        X_sample = X_explain[:budgets['kernel_explain_rows' if kind == 'KernelExplainer' else 'explain_rows']]
+        values = explain_rows(explainer, X_sample, budgets)
+
+    mean_shap = np.mean(np.abs(values), axis=0)
+    importance = dict(zip(feature_names, (float(v) for v in mean_shap)))
+    importance = dict(sorted(importance.items(), key=lambda x: x[1], reverse=True))
+    background_rows = {
+        'KernelExplainer': min(budgets['background_rows'], len(X_background)),
+        'LinearExplainer': min(budgets['linear_background_rows'], len(X_background))
+    }.get(kind)  # tree explainers use the node sample weights instead
+    stats = {
+        'explainer': kind,
+        'rows_explained': int(len(X_sample)),
+        'background_rows': background_rows,
+        'seconds': time.perf_counter() - start
+    }
+    return importance, stats
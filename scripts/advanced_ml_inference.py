@@ -0,0 +1,878 @@
+"""
+Inference side of the bootcamp predictor.
+
+Kept separate from advanced_ml_trainer.py so prediction processes import only
+what the saved artifacts need (numpy, pandas, joblib and whatever the pickled
+estimators pull in), not shap, imblearn or the model_selection machinery.
+"""
+import json
+import os
+import threading
+import warnings
+from collections import OrderedDict
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from advanced_ml_explain import explainer_filename, explain_matrix
+warnings.filterwarnings('ignore')
+
+ALGORITHM_NAMES = {
+    'logistic': 'Logistic Regression',
+    'decision_tree': 'Decision Tree',
+    'knn': 'k-Nearest Neighbors',
+    'svm': 'Support Vector Machine',
+    'adaboost': 'AdaBoost',
+    'xgboost': 'XGBoost'
+}
+
+
+PREPROCESSOR_VERSION = 1
+PREPROCESSOR_FILE = 'preprocessor.joblib'
+
+# Domain encodings shared by training and inference
+GENDER_MAP = {'L': 0, 'P': 1}
+EDUCATION_ORDER = {'SMA': 1, 'D3': 2, 'S1': 3, 'S2': 4, 'S3': 5}
+SCORE_FLOORS = {'logical_test_score': 60, 'tech_interview_grades': 65}
+
+# Saved model formats: 'joblib' pickles every model; 'mmap' stores XGBoost as its native
+# UBJSON booster (<alg_id>.ubj) and the rest as plain joblib files whose array buffers
+# (KNN training matrix, SVM support vectors, coefficients) are memory-mapped on load
+ARTIFACT_FORMATS = ('joblib', 'mmap')
+MODEL_SUFFIXES = ('.joblib', '.ubj')
+# Copy-on-write mapping: page-cache pages are shared between processes until written
+# (read-only 'r' would be cheaper still, but libsvm rejects read-only buffers)
+MMAP_MODE = 'c'
+# Booster attribute holding the XGBoost training hyperparameters, which the native format drops
+XGB_PARAMS_ATTR = 'training_params'
+
+
+def load_artifact(path, mmap_mode=None):
+    """Load a joblib artifact (arrays memory-mapped when mmap_mode is set) or an XGBoost native booster"""
+    if path.endswith('.ubj'):
+        from xgboost import XGBClassifier
+        model = XGBClassifier()
+        model.load_model(path)
+        return model
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+
+def dump_artifact(obj, path):
+    """
+    Write an artifact atomically. Readers that memory-mapped the previous file keep
+    its inode, so a retrain never truncates pages out from under a running server.
+    """
+    root, ext = os.path.splitext(path)
+    tmp_path = f'{root}.{os.getpid()}.tmp{ext}'  # XGBoost picks the format from the extension
+    try:
+        if ext == '.ubj':
+            obj.save_model(tmp_path)
+        else:
+            joblib.dump(obj, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def model_filename(models_dir, alg_id):
+    """File holding alg_id's saved model: the native booster when present, else the joblib pickle"""
+    native = f'{alg_id}.ubj'
+    if os.path.exists(os.path.join(models_dir, native)):
+        return native
+    return f'{alg_id}.joblib'
+
+
+def xgb_training_params(model):
+    """Training hyperparameters of an XGBoost model, including those a native (.ubj) booster saved aside"""
+    saved = model.get_booster().attr(XGB_PARAMS_ATTR)
+    params = json.loads(saved) if saved else {}
+    params.update({key: value for key, value in model.get_xgb_params().items() if value is not None})
+    return params
+
+
+def save_model_artifact(model, models_dir, alg_id, artifact_format='joblib'):
+    """Save a trained model in artifact_format and return its filename"""
+    if artifact_format not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unknown artifact format: {artifact_format}")
+    if artifact_format == 'mmap' and hasattr(model, 'get_booster'):
+        filename = f'{alg_id}.ubj'
+        # Kept so the booster can be trained further with the same settings (see update_saved_models)
+        model.get_booster().set_attr(**{XGB_PARAMS_ATTR: json.dumps(xgb_training_params(model), default=str)})
+    else:
+        filename = f'{alg_id}.joblib'
+    dump_artifact(model, os.path.join(models_dir, filename))
+    # Drop the model saved in the other format so model_filename cannot return a stale one
+    for suffix in MODEL_SUFFIXES:
+        stale = os.path.join(models_dir, f'{alg_id}{suffix}')
+        if suffix != os.path.splitext(filename)[1] and os.path.exists(stale):
+            os.remove(stale)
+    return filename
+
+
+class BootcampPreprocessor:
+    """
+    Fitted, versioned preprocessing for the bootcamp dataset.
+
+    Holds everything training learns about the features (column order,
+    categorical lookup tables, score floors, imputation means and scaler
+    statistics) and applies it as one array pass, so training and inference
+    run the exact same transform:
+
+        raw columns -> codes -> clip -> mean-impute -> standardize
+    """
+
+    def __init__(self):
+        self.version = PREPROCESSOR_VERSION
+        self.feature_names = []
+        self.column_kinds = {}     # col -> 'gender' | 'grades' | 'label' | 'numeric'
+        self.lookup_tables = {}    # col -> (pd.Index of raw values, codes array, unseen code)
+        self.clip_lower = None     # per-feature lower bound (-inf when unclipped)
+        self.fill_values = None    # per-feature imputation means
+        self.mean_ = None          # per-feature scaler mean (fit on the training split)
+        self.scale_ = None         # per-feature scaler std (1 where constant)
+        self.label_encoder = None  # target encoder (pass/failed)
+        self._partial = None       # per-column statistics between partial_fit and finish_fit
+        self._scaler = None        # running StandardScaler behind partial_fit_scaler
+
+    def fit_encode(self, X):
+        """Fit categorical encodings and imputation on X and return the unscaled matrix"""
+        self.partial_fit(X)
+        self.finish_fit()
+        return self.encode(X)
+
+    def partial_fit(self, X):
+        """
+        Accumulate the encoding statistics of one chunk of raw features; call finish_fit after
+        the last one. Column kinds come from the first chunk: later chunks of a numeric column
+        are coerced (unparseable values are imputed) and those of a text column read as strings.
+        """
+        if self._partial is None:
+            self.feature_names = X.columns.tolist()
+            self.column_kinds = {}
+            for col in self.feature_names:
+                if pd.api.types.is_numeric_dtype(X[col]):
+                    self.column_kinds[col] = 'numeric'
+                elif col in ('gender', 'grades'):
+                    self.column_kinds[col] = col
+                else:
+                    self.column_kinds[col] = 'label'
+            # Per column: [sum, count] of the clipped values, or {raw level: rows} for levels coded at finish_fit
+            self._partial = {col: ([0.0, 0] if self.column_kinds[col] in ('numeric', 'gender') else {})
+                             for col in self.feature_names}
+
+        for col in self.feature_names:
+            kind = self.column_kinds[col]
+            stats = self._partial[col]
+            if kind in ('numeric', 'gender'):
+                if kind == 'numeric':
+                    values = pd.to_numeric(X[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+                else:
+                    # Handle gender: L=0, P=1 (unknown left missing and imputed)
+                    positions = pd.Index(list(GENDER_MAP)).get_indexer(X[col])
+                    values = np.where(positions >= 0, np.array(list(GENDER_MAP.values()), dtype=float)[positions], np.nan)
+                values = np.maximum(values, SCORE_FLOORS.get(col, -np.inf))
+                stats[0] += float(np.nansum(values))
+                stats[1] += int(np.count_nonzero(~np.isnan(values)))
+            else:
+                if kind == 'grades':
+                    # Education levels keep their order; unknown defaults to SMA
+                    levels = X[col].map(EDUCATION_ORDER).astype(float).fillna(EDUCATION_ORDER['SMA']).astype(int)
+                else:
+                    levels = X[col].astype(str)
+                for level, rows in levels.value_counts(sort=False).items():
+                    stats[level] = stats.get(level, 0) + int(rows)
+
+    def finish_fit(self):
+        """Build the lookup tables and imputation means from the partial_fit statistics"""
+        self.lookup_tables = {}
+        self.clip_lower = np.array([SCORE_FLOORS.get(col, -np.inf) for col in self.feature_names], dtype=float)
+        means = np.full(len(self.feature_names), np.nan)
+        for j, col in enumerate(self.feature_names):
+            kind = self.column_kinds[col]
+            stats = self._partial[col]
+            if kind in ('numeric', 'gender'):
+                if kind == 'gender':
+                    self.lookup_tables[col] = (pd.Index(list(GENDER_MAP)), np.array(list(GENDER_MAP.values()), dtype=float), np.nan)
+                if stats[1]:
+                    means[j] = stats[0] / stats[1]
+                continue
+            if kind == 'grades':
+                # Label-encode the ordinal levels seen in training
+                classes = pd.Index(sorted(str(level) for level in stats))
+                to_code = lambda level: max(classes.get_indexer([str(level)])[0], 0)
+                self.lookup_tables[col] = (
+                    pd.Index(list(EDUCATION_ORDER)),
+                    np.array([to_code(level) for level in EDUCATION_ORDER.values()], dtype=float),
+                    float(to_code(EDUCATION_ORDER['SMA']))
+                )
+                level_codes = np.array([to_code(level) for level in stats], dtype=float)
+            else:
+                # General categorical encoding (unseen labels fall back to code 0)
+                classes = pd.Index(sorted(stats))
+                self.lookup_tables[col] = (classes, np.arange(len(classes), dtype=float), 0.0)
+                level_codes = classes.get_indexer(list(stats)).astype(float)
+            rows = np.array(list(stats.values()), dtype=float)
+            if rows.sum():
+                means[j] = np.maximum(level_codes, self.clip_lower[j]) @ rows / rows.sum()
+
+        # Handle missing values (NaN) with column means
+        self.fill_values = np.where(np.isnan(means), 0.0, means)
+        self._partial = None
+
+    def fit_scaler(self, X_encoded):
+        """Fit standardization on the (training split of the) encoded matrix and return it scaled"""
+        self.mean_ = X_encoded.mean(axis=0)
+        std = X_encoded.std(axis=0)
+        self.scale_ = np.where(std == 0, 1.0, std)
+        return self.scale(X_encoded)
+
+    def partial_fit_scaler(self, X_encoded):
+        """Update the standardization with one chunk of encoded training rows"""
+        from sklearn.preprocessing import StandardScaler
+
+        if len(X_encoded) == 0:
+            return
+        if self._scaler is None:
+            self._scaler = StandardScaler()
+        self._scaler.partial_fit(X_encoded)
+        self.mean_ = self._scaler.mean_
+        std = np.sqrt(self._scaler.var_)
+        self.scale_ = np.where(std == 0, 1.0, std)
+
+    def __getstate__(self):
+        # The saved artifact carries the fitted statistics, not the in-progress accumulators
+        state = self.__dict__.copy()
+        state['_partial'] = state['_scaler'] = None
+        return state
+
+    def __setstate__(self, state):
+        # Preprocessors saved before incremental fitting lack the accumulator slots
+        self.__dict__.update({'_partial': None, '_scaler': None}, **state)
+
+    def scale(self, X_encoded):
+        return (X_encoded - self.mean_) / self.scale_
+
+    def transform(self, df):
+        """Raw DataFrame -> scaled feature matrix in training column order"""
+        return self.scale(self.encode(df))
+
+    def encode(self, df):
+        """Raw DataFrame -> unscaled, imputed feature matrix"""
+        return self._encode(df, impute=True)
+
+    def _encode(self, df, impute):
+        n_rows = len(df)
+        X = np.full((n_rows, len(self.feature_names)), np.nan)
+        for j, col in enumerate(self.feature_names):
+            if col not in df.columns:
+                continue  # missing feature stays NaN and is imputed
+            kind = self.column_kinds[col]
+            if kind == 'numeric':
+                X[:, j] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+            else:
+                index, codes, unseen = self.lookup_tables[col]
+                values = df[col].astype(str) if kind == 'label' else df[col]
+                positions = index.get_indexer(values)
+                X[:, j] = np.where(positions >= 0, codes[positions], unseen)
+        X = np.maximum(X, self.clip_lower)
+        return self._impute(X) if impute else X
+
+    def _impute(self, X):
+        return np.where(np.isnan(X), self.fill_values, X)
+
+
+class ModelRegistry:
+    """
+    In-process cache of loaded joblib artifacts (models, preprocessors).
+
+    Entries are keyed by (models_dir, filename) and evicted least-recently-used
+    once max_entries or max_bytes is exceeded. Each lookup stats the file and
+    reloads the entry when its mtime/size changed, so a retrain that rewrites
+    saved_models/ takes effect without restarting the process.
+    Memory is estimated from the on-disk size of each artifact.
+    With mmap_mode set, joblib array buffers are memory-mapped instead of copied,
+    so processes loading the same files share one page-cached copy.
+    """
+
+    def __init__(self, max_entries=32, max_bytes=None, mmap_mode=MMAP_MODE):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.mmap_mode = mmap_mode
+        self._entries = OrderedDict()  # key -> (signature, nbytes, obj)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def get(self, models_dir, filename):
+        """Return the loaded artifact, (re)loading it if needed; None if the file is missing"""
+        path = os.path.abspath(os.path.join(models_dir, filename))
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self.discard(models_dir, filename)
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                self.reloads += 1
+            else:
+                self.misses += 1
+            obj = load_artifact(path, self.mmap_mode)
+            self._entries[path] = (signature, st.st_size, obj)
+            self._entries.move_to_end(path)
+            self._evict()
+            return obj
+
+    def discard(self, models_dir, filename=None):
+        """Drop one artifact, or every artifact of models_dir when filename is None"""
+        prefix = os.path.abspath(models_dir) + os.sep
+        with self._lock:
+            if filename is not None:
+                self._entries.pop(os.path.abspath(os.path.join(models_dir, filename)), None)
+            else:
+                for key in [k for k in self._entries if k.startswith(prefix)]:
+                    del self._entries[key]
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry[1] for entry in self._entries.values())
+
+    def stats(self):
+        """JSON-serializable cache statistics"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes(),
+                'hits': self.hits,
+                'misses': self.misses,
+                'reloads': self.reloads
+            }
+
+    def _evict(self):
+        # Always keep the most recently used entry, even if it alone exceeds the budget
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries) or
+            (self.max_bytes is not None and self.total_bytes() > self.max_bytes)
+        ):
+            self._entries.popitem(last=False)
+
+
+# Shared by every predictor in the process so loaded artifacts are reused across instances
+default_model_registry = ModelRegistry()
+
+
+# Models whose predict_proba cost grows with the training set; worth splitting into row shards
+SHARDABLE_MODELS = ('knn', 'svm')
+AUTO_SHARD_MIN_ROWS = 20000
+
+
+def resolve_n_jobs(n_jobs):
+    """joblib-style worker count: None -> 1, negative -> cpu_count + 1 + n_jobs"""
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, n_jobs)
+
+
+def positive_class_proba(model, X):
+    """Probability of class 1 (Pass), falling back to hard predictions for models without proba"""
+    if hasattr(model, 'predict_proba'):
+        return model.predict_proba(X)[:, 1]
+    return (model.predict(X) == 1).astype(float)
+
+
+def _score_shard_in_worker(models_dir, alg_id, X_shard):
+    """Process-pool entry point; each worker caches models in its own default registry"""
+    model = default_model_registry.get(models_dir, model_filename(models_dir, alg_id))
+    if model is None:
+        raise FileNotFoundError('Model not found')
+    return positive_class_proba(model, X_shard)
+
+
+def build_lookup_table(label_encoder):
+    """Index over a fitted LabelEncoder's classes; position in the index is the encoded value"""
+    return pd.Index(label_encoder.classes_)
+
+
+def encode_with_lookup(values, table, unseen=0):
+    """Vectorized LabelEncoder.transform over a Series; values missing from table map to unseen"""
+    codes = table.get_indexer(values.astype(str))
+    codes[codes < 0] = unseen
+    return codes
+
+
+class BootcampInferencePredictor:
+    """Loads saved preprocessing artifacts and models and scores new participants"""
+
+    def __init__(self, model_registry=None, n_jobs=1, shard_rows=None, parallel_backend='thread'):
+        self.algorithm_names = dict(ALGORITHM_NAMES)
+        # Batch scoring parallelism (see score_models); n_jobs=-1 uses every core
+        self.n_jobs = n_jobs
+        self.shard_rows = shard_rows
+        self.parallel_backend = parallel_backend
+        # Fitted preprocessing; populated by load_artifacts (or by training in the subclass)
+        self.preprocessor = None
+        # Legacy artifacts, only used for model dirs saved before preprocessor.joblib
+        self.scaler = None
+        self.label_encoder = None
+        self.column_encoders = {}
+        self.feature_names = []
+        # Loaded estimators/preprocessors are cached (and hot-reloaded) by the registry
+        self.model_registry = model_registry or default_model_registry
+        self.artifacts_dir = None
+
+    def __getstate__(self):
+        # The registry (locks, loaded models) stays in its process; workers use their own default
+        state = self.__dict__.copy()
+        state.pop('model_registry', None)
+        state.pop('_encoding_tables_cache', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.model_registry = default_model_registry
+
+    def load_artifacts(self, load_dir):
+        """Load models and preprocessors"""
+        preprocessor = self.model_registry.get(load_dir, PREPROCESSOR_FILE)
+        if preprocessor is not None:
+            if getattr(preprocessor, 'version', None) != PREPROCESSOR_VERSION:
+                raise ValueError(
+                    f"Unsupported preprocessor version {getattr(preprocessor, 'version', None)} "
+                    f"(expected {PREPROCESSOR_VERSION}); please retrain"
+                )
+            self.preprocessor = preprocessor
+            self.label_encoder = preprocessor.label_encoder
+            self.feature_names = preprocessor.feature_names
+            self.artifacts_dir = load_dir
+            return self
+
+        # Legacy model dirs (before preprocessor.joblib): separate scaler/encoder files
+        scaler = self.model_registry.get(load_dir, 'scaler.joblib')
+        label_encoder = self.model_registry.get(load_dir, 'label_encoder.joblib')
+        column_encoders = self.model_registry.get(load_dir, 'column_encoders.joblib')
+        if scaler is None or label_encoder is None or column_encoders is None:
+            raise FileNotFoundError(f"Preprocessing artifacts not found in {load_dir}")
+        self.preprocessor = None
+        self.scaler = scaler
+        self.label_encoder = label_encoder
+        self.column_encoders = column_encoders
+        self.artifacts_dir = load_dir
+        return self
+
+    def _refresh_artifacts(self):
+        """Pick up preprocessors rewritten by a retrain since load_artifacts"""
+        if self.artifacts_dir is not None:
+            self.load_artifacts(self.artifacts_dir)
+
+    def available_models(self, models_dir='saved_models'):
+        """List algorithm ids that have a saved model in models_dir"""
+        if not os.path.isdir(models_dir):
+            return []
+        return sorted({
+            root for root, ext in map(os.path.splitext, os.listdir(models_dir))
+            if ext in MODEL_SUFFIXES and root in self.algorithm_names
+        })
+
+    def load_models(self, model_ids, models_dir='saved_models'):
+        """Load saved models into memory so later predictions skip deserialization"""
+        loaded = []
+        for alg_id in model_ids:
+            if self.get_model(alg_id, models_dir) is not None:
+                loaded.append(alg_id)
+        return loaded
+
+    def get_model(self, alg_id, models_dir='saved_models'):
+        """Return the saved model for alg_id from the registry (None if missing)"""
+        return self.model_registry.get(models_dir, model_filename(models_dir, alg_id))
+
+    def get_explainer(self, alg_id, models_dir='saved_models'):
+        """Saved SHAP explainer artifact for alg_id (None if the model was saved without one)"""
+        return self.model_registry.get(models_dir, explainer_filename(alg_id))
+
+    def explain_models(self, X_scaled, model_ids, models_dir='saved_models'):
+        """
+        Per-row SHAP contributions from each model's saved explainer.
+        Returns alg_id -> {'base_value', 'scale', 'feature_names', 'values'} or {'error': message}
+        """
+        explanations = {}
+        for alg_id in model_ids:
+            try:
+                artifact = self.get_explainer(alg_id, models_dir)
+                if artifact is None:
+                    explanations[alg_id] = {'error': 'Explainer not found; retrain to enable explanations'}
+                    continue
+                explanations[alg_id] = explain_matrix(artifact, X_scaled, n_jobs=self.n_jobs)
+            except Exception as e:
+                explanations[alg_id] = {'error': str(e)}
+        return explanations
+
+    def predict_new_data(self, data_dict, model_ids, models_dir='saved_models', explain=False):
+        """
+        Predict for a single participant
+        data_dict: dictionary of feature values
+        model_ids: list of algorithm names to use
+        explain: add per-feature SHAP contributions to each model's result
+        """
+        import pandas as pd
+        
+        # Convert single dict to DataFrame
+        df = pd.DataFrame([data_dict])
+        self._refresh_artifacts()
+        X_scaled = self._preprocess_inference(df)
+        
+        predictions = {}
+        for alg_id in model_ids:
+            model = self.get_model(alg_id, models_dir)
+            if model is None:
+                predictions[alg_id] = {'error': 'Model not found'}
+                continue
+                
+            prob = 0.5
+            pred_class = "unknown"
+            
+            try:
+                # Predict probability
+                if hasattr(model, 'predict_proba'):
+                    prob = model.predict_proba(X_scaled)[0][1] # Probability of class 1 (Pass)
+                else:
+                    # Fallback for models without proba (shouldn't happen with our config)
+                    pred = model.predict(X_scaled)[0]
+                    prob = 1.0 if pred == 1 else 0.0
+                
+                # Return standardized format
+                pred_label = 'pass' if prob > 0.5 else 'fail'
+                confidence = prob if prob > 0.5 else 1 - prob
+                
+                predictions[alg_id] = {
+                    'prediction': pred_label,
+                    'confidence': float(confidence)
+                }
+            except Exception as e:
+                predictions[alg_id] = {'error': str(e)}
+
+        if explain:
+            scored = [alg_id for alg_id in model_ids if 'error' not in predictions[alg_id]]
+            for alg_id, explanation in self.explain_models(X_scaled, scored, models_dir).items():
+                predictions[alg_id]['explanation'] = explanation_record(explanation, 0)
+                
+        return predictions
+        
+    def _encoding_tables(self):
+        """Category -> code lookup tables for column_encoders, rebuilt only when the encoders change"""
+        cached = getattr(self, '_encoding_tables_cache', None)
+        if cached is not None and cached[0] is self.column_encoders:
+            return cached[1]
+        tables = {col: build_lookup_table(le) for col, le in self.column_encoders.items()}
+        self._encoding_tables_cache = (self.column_encoders, tables)
+        return tables
+
+    def _preprocess_inference(self, df):
+        """Preprocess inference data (shared between single and batch)"""
+        if self.preprocessor is not None:
+            return self.preprocessor.transform(df)
+        return self._preprocess_inference_legacy(df)
+
+    def _preprocess_inference_legacy(self, df):
+        """Hand-written inference preprocessing for model dirs without preprocessor.joblib"""
+        import pandas as pd
+        import numpy as np
+
+        # 1. Preprocess
+        # Manual mapping for ordered/specific columns
+        if 'gender' in df.columns:
+             df['gender'] = df['gender'].map(GENDER_MAP)
+        
+        if 'grades' in df.columns:
+            # Fill unknown with default (SMA=1) or handle error
+            df['grades'] = df['grades'].map(EDUCATION_ORDER).fillna(1)
+            
+        # Apply strict column encoding with precomputed category -> code tables
+        # (unseen labels fall back to code 0)
+        for col, table in self._encoding_tables().items():
+            if col in df.columns:
+                df[col] = encode_with_lookup(df[col], table)
+
+        # Scale
+        X_aligned = pd.DataFrame(index=df.index)
+        
+        if hasattr(self.scaler, 'feature_names_in_'):
+            dataset_features = self.scaler.feature_names_in_
+        else:
+            dataset_features = df.columns
+            
+        for feature in dataset_features:
+            if feature in df.columns:
+                X_aligned[feature] = df[feature]
+            else:
+                X_aligned[feature] = 0 # Missing feature
+                
+        # Fill any remaining NaNs (e.g. from missing columns)
+        X_aligned = X_aligned.fillna(0)
+                
+        return self.scaler.transform(X_aligned)
+
+    def score_models(self, X_scaled, model_ids, models_dir='saved_models'):
+        """
+        Score every model on one preprocessed matrix.
+        Returns alg_id -> {'passed': bool array, 'confidence': float array} or {'error': message}
+
+        With n_jobs > 1 the models run concurrently on a thread pool sharing X_scaled
+        (or a process pool, parallel_backend='process'), and the slow neighbor/kernel
+        models (SHARDABLE_MODELS) are also split into row shards of shard_rows.
+        """
+        scores = {}
+        tasks = []
+        for alg_id in model_ids:
+            model = self.get_model(alg_id, models_dir)
+            if model is None:
+                scores[alg_id] = {'error': 'Model not found'}
+                continue
+            tasks.extend((alg_id, start, stop) for start, stop in self._row_shards(alg_id, len(X_scaled)))
+
+        n_jobs = resolve_n_jobs(self.n_jobs)
+        if n_jobs <= 1 or len(tasks) <= 1:
+            shard_probs = {}
+            for alg_id, start, stop in tasks:
+                try:
+                    shard_probs[(alg_id, start)] = positive_class_proba(self.get_model(alg_id, models_dir), X_scaled[start:stop])
+                except Exception as e:
+                    scores[alg_id] = {'error': str(e)}
+        else:
+            shard_probs = self._score_parallel(tasks, X_scaled, models_dir, n_jobs, scores)
+
+        for alg_id in model_ids:
+            if alg_id in scores:
+                continue
+            # Batch predict (shards concatenated back in row order)
+            probs = np.concatenate([shard_probs[(a, start)] for a, start, _ in tasks if a == alg_id])
+            passed = probs > 0.5
+            scores[alg_id] = {'passed': passed, 'confidence': np.where(passed, probs, 1 - probs)}
+        return {alg_id: scores[alg_id] for alg_id in model_ids}
+
+    def _row_shards(self, alg_id, n_rows):
+        """(start, stop) row ranges to score alg_id on; one range unless it is shardable"""
+        shard_rows = self.shard_rows
+        n_jobs = resolve_n_jobs(self.n_jobs)
+        if alg_id not in SHARDABLE_MODELS or n_jobs <= 1 or shard_rows == 0:
+            return [(0, n_rows)]
+        if shard_rows is None:
+            # Auto: one shard per worker once the batch is big enough to amortize the overhead
+            if n_rows < AUTO_SHARD_MIN_ROWS:
+                return [(0, n_rows)]
+            shard_rows = -(-n_rows // n_jobs)
+        return [(start, min(start + shard_rows, n_rows)) for start in range(0, max(n_rows, 1), shard_rows)]
+
+    def _score_parallel(self, tasks, X_scaled, models_dir, n_jobs, scores):
+        if self.parallel_backend == 'process':
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=n_jobs)
+            submit = lambda alg_id, start, stop: executor.submit(
+                _score_shard_in_worker, os.path.abspath(models_dir), alg_id, X_scaled[start:stop]
+            )
+        elif self.parallel_backend == 'thread':
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(max_workers=n_jobs)
+            submit = lambda alg_id, start, stop: executor.submit(
+                positive_class_proba, self.get_model(alg_id, models_dir), X_scaled[start:stop]
+            )
+        else:
+            raise ValueError(f"Unknown parallel backend: {self.parallel_backend}")
+
+        shard_probs = {}
+        with executor:
+            futures = {(alg_id, start): submit(alg_id, start, stop) for alg_id, start, stop in tasks}
+            for (alg_id, start), future in futures.items():
+                try:
+                    shard_probs[(alg_id, start)] = future.result()
+                except Exception as e:
+                    scores[alg_id] = {'error': str(e)}
+        return shard_probs
+
+    def score_batch(self, df, model_ids, models_dir='saved_models', explain=False):
+        """
+        Preprocess a raw DataFrame and score it with every model (see score_models).
+        explain: also attach each model's per-row SHAP contributions under 'explanation'
+        """
+        self._refresh_artifacts()
+        X_scaled = self._preprocess_inference(df)
+        scores = self.score_models(X_scaled, model_ids, models_dir)
+        if explain:
+            scored = [alg_id for alg_id in model_ids if 'error' not in scores[alg_id]]
+            for alg_id, explanation in self.explain_models(X_scaled, scored, models_dir).items():
+                scores[alg_id]['explanation'] = explanation
+        return scores
+
+    def predict_batch(self, df, model_ids, models_dir='saved_models', output='rows', explain=False):
+        """
+        Batch prediction for DataFrame
+        output='rows': list of per-row dicts {alg_id: {'prediction', 'confidence'}}
+        output='columnar': per-model arrays (see columnar_result)
+        explain: add per-feature SHAP contributions ('explanation') for every row
+        """
+        scores = self.score_batch(df, model_ids, models_dir, explain=explain)
+
+        if output == 'columnar':
+            return columnar_result(scores, len(df))
+        if output != 'rows':
+            raise ValueError(f"Unknown batch output mode: {output}")
+        return list(iter_row_records(scores, len(df)))
+
+    def iter_batch_records(self, df, model_ids, models_dir='saved_models', explain=False):
+        """Yield per-row prediction dicts one at a time instead of materializing the whole list"""
+        yield from iter_row_records(self.score_batch(df, model_ids, models_dir, explain=explain), len(df))
+
+    def predict_csv_stream(self, csv_path, model_ids, out, models_dir='saved_models',
+                           chunksize=50000, fmt='ndjson', column_map=None, explain=False):
+        """
+        Score a CSV of any size in fixed-size chunks, writing results to the text stream out
+        as they are produced (fmt 'ndjson': one record per row, 'csv': one column pair per model).
+        Peak memory is bounded by chunksize, not by the file size.
+        """
+        if fmt not in ('ndjson', 'csv'):
+            raise ValueError(f"Unknown stream format: {fmt}")
+        total_rows = 0
+        n_chunks = 0
+        errors = {}
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            if column_map:
+                chunk = chunk.rename(columns=column_map)
+            scores = self.score_batch(chunk, model_ids, models_dir, explain=explain)
+            if fmt == 'ndjson':
+                write_ndjson(scores, len(chunk), out)
+            else:
+                write_csv_chunk(scores, len(chunk), out, start_row=total_rows, header=(n_chunks == 0))
+            errors.update({alg_id: score['error'] for alg_id, score in scores.items() if 'error' in score})
+            total_rows += len(chunk)
+            n_chunks += 1
+        out.flush()
+        return {'total_rows': total_rows, 'chunks': n_chunks, 'chunksize': chunksize, 'errors': errors}
+
+
+BATCH_LABELS = ['fail', 'pass']
+
+
+def explanation_record(explanation, i):
+    """JSON-ready explanation of row i: base value, scale and feature -> contribution"""
+    if 'error' in explanation:
+        return {'error': explanation['error']}
+    return {
+        'base_value': explanation['base_value'],
+        'scale': explanation['scale'],
+        'contributions': dict(zip(explanation['feature_names'], explanation['values'][i].tolist()))
+    }
+
+
+def iter_row_records(scores, n_rows):
+    """Per-row records from score_models output, in the legacy batch_predictions shape"""
+    columns = {}
+    for alg_id, score in scores.items():
+        if 'error' in score:
+            columns[alg_id] = None
+        else:
+            columns[alg_id] = (np.where(score['passed'], 'pass', 'fail').tolist(), score['confidence'].tolist())
+    for i in range(n_rows):
+        row = {}
+        for alg_id, column in columns.items():
+            if column is None:
+                row[alg_id] = {'error': scores[alg_id]['error']}
+            else:
+                row[alg_id] = {'prediction': column[0][i], 'confidence': column[1][i]}
+                if 'explanation' in scores[alg_id]:
+                    row[alg_id]['explanation'] = explanation_record(scores[alg_id]['explanation'], i)
+        yield row
+
+
+def write_ndjson(scores, n_rows, out):
+    """Write per-row records as newline-delimited JSON"""
+    for row in iter_row_records(scores, n_rows):
+        out.write(json.dumps(row))
+        out.write('\n')
+
+
+def write_csv_chunk(scores, n_rows, out, start_row=0, header=True):
+    """Write one chunk of scores as CSV: row, <alg_id>_prediction, <alg_id>_confidence, ..."""
+    frame = {'row': np.arange(start_row, start_row + n_rows)}
+    for alg_id, score in scores.items():
+        if 'error' in score:
+            frame[f'{alg_id}_prediction'] = np.full(n_rows, 'error')
+            frame[f'{alg_id}_confidence'] = np.full(n_rows, np.nan)
+        else:
+            frame[f'{alg_id}_prediction'] = np.where(score['passed'], 'pass', 'fail')
+            frame[f'{alg_id}_confidence'] = score['confidence']
+            frame.update(explanation_columns(alg_id, score.get('explanation')))
+    pd.DataFrame(frame).to_csv(out, index=False, header=header)
+
+
+def explanation_columns(alg_id, explanation):
+    """Flat '<alg_id>_shap_<feature>' arrays for CSV/NPZ/Arrow outputs (empty without explanations)"""
+    if not explanation or 'error' in explanation:
+        return {}
+    return {f'{alg_id}_shap_{name}': explanation['values'][:, j] for j, name in enumerate(explanation['feature_names'])}
+
+
+def columnar_result(scores, n_rows):
+    """
+    Compact JSON-ready batch result: one array per model instead of one dict per row.
+    prediction holds indices into labels (0 = fail, 1 = pass).
+    """
+    models = {}
+    for alg_id, score in scores.items():
+        if 'error' in score:
+            models[alg_id] = {'error': score['error']}
+        else:
+            models[alg_id] = {
+                'prediction': score['passed'].astype(np.uint8).tolist(),
+                'confidence': score['confidence'].tolist()
+            }
+            explanation = score.get('explanation')
+            if explanation is not None and 'error' in explanation:
+                models[alg_id]['explanation'] = {'error': explanation['error']}
+            elif explanation is not None:
+                models[alg_id]['explanation'] = {
+                    'base_value': explanation['base_value'],
+                    'scale': explanation['scale'],
+                    'contributions': {name: explanation['values'][:, j].tolist()
+                                      for j, name in enumerate(explanation['feature_names'])}
+                }
+    return {'format': 'columnar', 'labels': BATCH_LABELS, 'n_rows': n_rows, 'models': models}
+
+
+def columnar_arrays(scores):
+    """Flat name -> NumPy array mapping ('<alg_id>_prediction', '<alg_id>_confidence') for NPZ/Arrow"""
+    arrays = {}
+    for alg_id, score in scores.items():
+        if 'error' in score:
+            continue
+        arrays[f'{alg_id}_prediction'] = score['passed'].astype(np.uint8)
+        arrays[f'{alg_id}_confidence'] = score['confidence']
+        arrays.update(explanation_columns(alg_id, score.get('explanation')))
+    return arrays
+
+
+def save_columnar(scores, path, fmt='npz'):
+    """Write score_models output as an NPZ archive or an Arrow (Feather v2) file"""
+    arrays = columnar_arrays(scores)
+    if fmt == 'npz':
+        np.savez(path, **arrays)
+    elif fmt == 'arrow':
+        try:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+        except ImportError:
+            raise ImportError("Arrow output requires pyarrow (pip install pyarrow)")
+        feather.write_feather(pa.table(arrays), path)
+    else:
+        raise ValueError(f"Unknown columnar file format: {fmt}")
+    return sorted(arrays)
@@ -0,0 +1,56 @@
+"""
+Typed, chunked reading of training uploads.
+
+Training never holds the raw upload as one DataFrame: iter_chunks yields it in
+chunk_rows-sized pieces parsed straight into the declared TRAINING_SCHEMA dtypes
+(categoricals for the text columns, float32 for the numeric ones), and the
+trainer fits the preprocessor on them incrementally (see
+AdvancedMLBootcampPredictor.prepare_dataset). CSV is read with pandas;
+Parquet input needs pyarrow, which is optional and imported only for it.
+"""
+import os
+
+import pandas as pd
+
+# Known bootcamp columns. float32 holds the ages and 0-100 scores exactly and takes
+# missing values; other columns keep pandas' inferred dtype.
+TRAINING_SCHEMA = {
+    'age': 'float32',
+    'gender': 'category',
+    'grades': 'category',
+    'majoring': 'category',
+    'logical_test_score': 'float32',
+    'tech_interview_grades': 'float32',
+    'class': 'category'
+}
+INPUT_FORMATS = ('csv', 'parquet')
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+# Rows parsed at a time; bounds the raw-data memory of training
+DEFAULT_CHUNK_ROWS = 100000
+
+
+def input_format(path):
+    """'parquet' for .parquet/.pq files, else 'csv'"""
+    return 'parquet' if os.path.splitext(path)[1].lower() in PARQUET_SUFFIXES else 'csv'
+
+
+def _parquet_chunks(path, chunk_rows, schema):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet input requires pyarrow (pip install pyarrow)")
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+        chunk = batch.to_pandas()
+        yield chunk.astype({col: dtype for col, dtype in schema.items() if col in chunk.columns})
+
+
+def iter_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS, schema=TRAINING_SCHEMA):
+    """Yield the CSV or Parquet file at path as DataFrames of up to chunk_rows rows, typed by schema"""
+    try:
+        if input_format(path) == 'parquet':
+            yield from _parquet_chunks(path, chunk_rows, schema)
+        else:
+            # dtype entries for columns the file lacks are ignored
+            yield from pd.read_csv(path, dtype=schema, chunksize=chunk_rows)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"{os.path.basename(path)} does not match the training schema: {e}") from e
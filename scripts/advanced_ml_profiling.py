@@ -0,0 +1,164 @@
+"""
+Stage timing for the training pipeline.
+
+StageTimer records wall time, CPU time and peak memory for named stages,
+optionally per algorithm, and can dump a cProfile (or pyinstrument) profile
+of a chosen stage. Peak memory modes:
+  'rss'         - peak resident set size of the process during the stage, from the
+                  kernel's resettable high-water mark (Linux; near-free)
+  'tracemalloc' - peak Python/NumPy allocations above the stage's starting point
+                  (any platform, but slows training noticeably)
+  None          - not measured
+"""
+import os
+import time
+from contextlib import contextmanager
+
+MEMORY_MODES = ('rss', 'tracemalloc')
+PROFILERS = ('cprofile', 'pyinstrument')
+
+
+def _proc_status_mb(field):
+    """A kB field of /proc/self/status in MB (None where unavailable)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_rss_peak():
+    """Reset VmHWM to the current RSS; False if the kernel does not allow it"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class StageTimer:
+    """
+    Collects {'wall_s', 'cpu_s', 'peak_mb', 'calls'} per stage.
+    Stages nest (an algorithm's 'total' contains its 'tuning'); repeated stages accumulate.
+    profile_stage: stage name ('shap') or 'algorithm.stage' ('xgboost.tuning') to profile
+    profiler: one of PROFILERS; pyinstrument is optional and checked here, not when the stage starts
+    """
+
+    def __init__(self, memory='rss', profile_stage=None, profile_dir='profiles', profiler='cprofile'):
+        if memory == 'rss' and not _reset_rss_peak():
+            memory = None
+        if memory not in MEMORY_MODES + (None,):
+            raise ValueError(f"Unknown memory mode: {memory}")
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler: {profiler}")
+        if profile_stage and profiler == 'pyinstrument':
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError:
+                raise ImportError("pyinstrument profiles require pyinstrument (pip install pyinstrument)")
+        self.memory = memory
+        self.profile_stage = profile_stage
+        self.profile_dir = profile_dir
+        self.profiler = profiler
+        self.stages = {}
+        self.algorithms = {}
+        self._open = []  # per open stage: highest memory reading seen so far
+
+    def options(self):
+        """Constructor arguments, so worker processes can time their stages the same way"""
+        return {'memory': self.memory, 'profile_stage': self.profile_stage,
+                'profile_dir': self.profile_dir, 'profiler': self.profiler}
+
+    def _memory_peak(self):
+        if self.memory == 'rss':
+            return _proc_status_mb('VmHWM')
+        import tracemalloc
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+
+    def _memory_reset(self):
+        if self.memory == 'rss':
+            _reset_rss_peak()
+            return 0.0
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0] / 1024 / 1024
+
+    @contextmanager
+    def stage(self, name, algorithm=None):
+        key = f"{algorithm}.{name}" if algorithm else name
+        if self.memory:
+            # The peak so far belongs to every enclosing stage before the counter is reset
+            current = self._memory_peak() or 0.0
+            for frame in self._open:
+                frame['peak'] = max(frame['peak'], current)
+            frame = {'base': self._memory_reset(), 'peak': 0.0}
+            self._open.append(frame)
+        profiler = self._start_profiler() if self.profile_stage in (name, key) else None
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            record = {'wall_s': wall, 'cpu_s': cpu, 'peak_mb': None, 'calls': 1}
+            if profiler is not None:
+                record['profile'] = self._stop_profiler(profiler, key)
+            if self.memory:
+                frame = self._open.pop()
+                frame['peak'] = max(frame['peak'], self._memory_peak() or 0.0)
+                for parent in self._open:
+                    parent['peak'] = max(parent['peak'], frame['peak'])
+                record['peak_mb'] = frame['peak'] - frame['base']
+            self._add(self.algorithms.setdefault(algorithm, {}) if algorithm else self.stages, name, record)
+
+    @staticmethod
+    def _add(records, name, record):
+        previous = records.get(name)
+        if previous is None:
+            records[name] = record
+            return
+        previous['wall_s'] += record['wall_s']
+        previous['cpu_s'] += record['cpu_s']
+        previous['calls'] += record['calls']
+        if record['peak_mb'] is not None:
+            previous['peak_mb'] = max(previous['peak_mb'] or 0.0, record['peak_mb'])
+        if 'profile' in record:
+            previous['profile'] = record['profile']
+
+    def merge_algorithm(self, algorithm, records):
+        """Fold in stage records timed elsewhere (e.g. in a training worker process)"""
+        target = self.algorithms.setdefault(algorithm, {})
+        for name, record in records.items():
+            self._add(target, name, dict(record))
+
+    def _start_profiler(self):
+        if self.profiler == 'pyinstrument':
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            profiler.start()
+        else:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return profiler
+
+    def _stop_profiler(self, profiler, key):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        if self.profiler == 'pyinstrument':
+            profiler.stop()
+            path = os.path.join(self.profile_dir, f'{key}.{os.getpid()}.{time.time_ns()}.html')
+            with open(path, 'w') as f:
+                f.write(profiler.output_html())
+        else:
+            profiler.disable()
+            path = os.path.join(self.profile_dir, f'{key}.{os.getpid()}.{time.time_ns()}.prof')
+            profiler.dump_stats(path)  # inspect with: python -m pstats <file>
+        return path
+
+    def as_dict(self):
+        return {'memory': self.memory, 'stages': self.stages, 'algorithms': self.algorithms}
@@ -0,0 +1,220 @@
+"""
+Rebalancing of the (scaled) training split for the imbalanced pass/failed classes.
+
+resample_training_set runs one of RESAMPLING_METHODS:
+  smote         - SMOTE synthetic minority rows. Float64 without a cap gives exactly the rows of
+                  imblearn's SMOTE(random_state=42), but they are written into one preallocated
+                  matrix in chunks instead of stacking full copies, and the k-neighbour search
+                  runs over chunks of query rows on n_jobs threads
+  random        - random oversampling (the rows of imblearn's RandomOverSampler), no neighbour search
+  class_weight  - no new rows; the estimators weight classes instead (see class_weight_params)
+dtype 'float32' halves the resampled matrix; max_synthetic caps the generated rows (each
+class keeps its share). The trainer records the stage's time and peak memory next to the
+report returned here.
+
+Resampling before cross-validation lets synthetic (or duplicated) copies of validation rows
+into the training folds and inflates the CV score. resample_cv_folds rebalances each fold's
+training rows instead, once per fold: the new rows are appended to one matrix and a
+ResampledFolds splitter points every search candidate at them, so the search scores on
+original validation rows without repeating the neighbour search per candidate.
+"""
+import numpy as np
+
+RESAMPLING_METHODS = ('smote', 'random', 'class_weight')
+RESAMPLING_DTYPES = ('float64', 'float32')
+SMOTE_K_NEIGHBORS = 5
+# Rows per neighbour query and per block of generated rows (bounds the temporaries)
+RESAMPLING_CHUNK_ROWS = 50000
+RESAMPLING_DEFAULTS = {
+    'method': 'smote',
+    'dtype': 'float64',
+    'max_synthetic': None,   # cap on generated rows (None = balance the classes fully)
+    'n_jobs': 1,             # threads for the SMOTE neighbour search (-1 = all cores)
+    'chunk_rows': RESAMPLING_CHUNK_ROWS,
+    'in_folds': False        # tune on folds resampled separately (resample_cv_folds) instead of the resampled set
+}
+
+
+def oversampling_targets(y, max_synthetic=None):
+    """Rows to generate per class to match the majority class, scaled down to max_synthetic in total"""
+    classes, counts = np.unique(y, return_counts=True)
+    needed = counts.max() - counts
+    total = int(needed.sum())
+    if max_synthetic is not None and total > max_synthetic:
+        needed = needed * max_synthetic // total
+    return {cls: int(n) for cls, n in zip(classes, needed) if n > 0}, total
+
+
+def _allocate(X, y, n_new, dtype):
+    """Output arrays holding the original rows followed by n_new rows to fill"""
+    X_out = np.empty((len(X) + n_new, X.shape[1]), dtype=dtype)
+    X_out[:len(X)] = X
+    y_out = np.empty(len(y) + n_new, dtype=y.dtype)
+    y_out[:len(y)] = y
+    return X_out, y_out
+
+
+def _smote_rows(X, y, targets, X_out, y_out, start, dtype, n_jobs, chunk_rows, k_neighbors, random_state):
+    """Write the SMOTE rows for targets ({class: rows}) into X_out, y_out from row start"""
+    from sklearn.neighbors import NearestNeighbors
+
+    for cls, n_samples in targets.items():
+        X_class = X[y == cls].astype(dtype, copy=False)
+        nn = NearestNeighbors(n_neighbors=k_neighbors + 1, n_jobs=n_jobs).fit(X_class)
+        neighbours = np.empty((len(X_class), k_neighbors), dtype=np.intp)
+        for i in range(0, len(X_class), chunk_rows):
+            # The nearest neighbour of each row is the row itself
+            neighbours[i:i + chunk_rows] = nn.kneighbors(X_class[i:i + chunk_rows], return_distance=False)[:, 1:]
+
+        # Same draws as imblearn: a fresh generator per class, neighbour picks then step sizes
+        rng = np.random.RandomState(random_state)
+        rows, cols = np.divmod(rng.randint(low=0, high=neighbours.size, size=n_samples), k_neighbors)
+        steps = rng.uniform(size=n_samples)[:, np.newaxis]
+        for i in range(0, n_samples, chunk_rows):
+            r, c = rows[i:i + chunk_rows], cols[i:i + chunk_rows]
+            base = X_class[r]
+            X_out[start + i:start + i + len(r)] = base + steps[i:i + chunk_rows] * (X_class[neighbours[r, c]] - base)
+        y_out[start:start + n_samples] = cls
+        start += n_samples
+
+
+def _random_rows(X, y, targets, X_out, y_out, start, chunk_rows, random_state):
+    """Write randomly duplicated rows for targets ({class: rows}) into X_out, y_out from row start"""
+    rng = np.random.RandomState(random_state)
+    for cls, n_samples in targets.items():
+        picks = rng.choice(np.flatnonzero(y == cls), size=n_samples, replace=True)
+        for i in range(0, n_samples, chunk_rows):
+            block = picks[i:i + chunk_rows]
+            X_out[start + i:start + i + len(block)] = X[block]
+        y_out[start:start + n_samples] = cls
+        start += n_samples
+
+
+def smote_resample(X, y, targets, dtype='float64', n_jobs=1, chunk_rows=RESAMPLING_CHUNK_ROWS,
+                   k_neighbors=SMOTE_K_NEIGHBORS, random_state=42):
+    """SMOTE rows for targets ({class: rows}) appended to X, y"""
+    X_out, y_out = _allocate(X, y, sum(targets.values()), dtype)
+    _smote_rows(X, y, targets, X_out, y_out, len(X), dtype, n_jobs, chunk_rows, k_neighbors, random_state)
+    return X_out, y_out
+
+
+def random_oversample(X, y, targets, dtype='float64', chunk_rows=RESAMPLING_CHUNK_ROWS, random_state=42):
+    """Randomly duplicated rows for targets ({class: rows}) appended to X, y"""
+    X_out, y_out = _allocate(X, y, sum(targets.values()), dtype)
+    _random_rows(X, y, targets, X_out, y_out, len(X), chunk_rows, random_state)
+    return X_out, y_out
+
+
+def class_weight_params(model, y):
+    """
+    Params making model weight classes inversely to their frequency in y: class_weight='balanced'
+    where the estimator (or a pipeline's final step) takes it, scale_pos_weight for binary XGBoost.
+    Empty for estimators without class weights (KNN, AdaBoost), which then train unweighted.
+    """
+    params = model.get_params()
+    if 'class_weight' in params:
+        return {'class_weight': 'balanced'}
+    if params.get('steps'):
+        key = f"{params['steps'][-1][0]}__class_weight"
+        return {key: 'balanced'} if key in params else {}
+    if 'scale_pos_weight' in params:
+        counts = np.bincount(np.asarray(y).astype(int))
+        if len(counts) == 2 and counts[1] > 0:
+            return {'scale_pos_weight': float(counts[0] / counts[1])}
+    return {}
+
+
+def resample_training_set(X, y, method='smote', dtype='float64', max_synthetic=None, n_jobs=1,
+                          chunk_rows=RESAMPLING_CHUNK_ROWS):
+    """Rebalance a training split with method (see RESAMPLING_METHODS); returns X, y and a report"""
+    if method not in RESAMPLING_METHODS:
+        raise ValueError(f"Unknown resampling method '{method}' (choose from {', '.join(RESAMPLING_METHODS)})")
+    if dtype not in RESAMPLING_DTYPES:
+        raise ValueError(f"Unknown resampling dtype '{dtype}' (choose from {', '.join(RESAMPLING_DTYPES)})")
+    X, y = np.asarray(X), np.asarray(y)
+    targets, requested = oversampling_targets(y, max_synthetic)
+    report = {'method': method, 'dtype': dtype, 'rows_before': int(len(X))}
+    if method == 'class_weight':
+        from sklearn.utils.class_weight import compute_class_weight
+        classes = np.unique(y)
+        X_out, y_out = X.astype(dtype, copy=False), y
+        report['class_weights'] = {str(cls): float(w) for cls, w in zip(classes, compute_class_weight('balanced', classes=classes, y=y))}
+    elif method == 'smote':
+        X_out, y_out = smote_resample(X, y, targets, dtype, n_jobs=n_jobs, chunk_rows=chunk_rows)
+    else:
+        X_out, y_out = random_oversample(X, y, targets, dtype, chunk_rows=chunk_rows)
+    report.update({
+        'rows_after': int(len(X_out)),
+        'synthetic_rows': int(len(X_out) - len(X)),
+        'requested_synthetic_rows': requested,
+        'capped': method != 'class_weight' and sum(targets.values()) < requested,
+        'output_mb': float(X_out.nbytes / 1024 / 1024)
+    })
+    return X_out, y_out, report
+
+
+class ResampledFolds:
+    """
+    Precomputed CV splits over X, y (original rows followed by every fold's new rows): fold i trains
+    on its original training rows plus the rows resampled from them and validates on original rows.
+    Usable as the cv of GridSearchCV & co. together with X and y.
+    """
+
+    def __init__(self, X, y, folds, description):
+        self.X = X
+        self.y = y
+        self.folds = folds
+        self.description = description
+
+    def split(self, X=None, y=None, groups=None):
+        yield from self.folds
+
+    def get_n_splits(self, X=None, y=None, groups=None):
+        return len(self.folds)
+
+    def __repr__(self):
+        # Stable text for CVScoreCache keys (the arrays themselves are hashed separately)
+        return f"ResampledFolds({self.description})"
+
+
+def resample_cv_folds(X, y, cv, method='smote', dtype='float64', max_synthetic=None, n_jobs=1,
+                      chunk_rows=RESAMPLING_CHUNK_ROWS):
+    """
+    Rebalance the training rows of each cv split of X, y separately; returns a ResampledFolds and a report.
+    Each fold gets the rows resample_training_set would give for its training rows alone (max_synthetic
+    scaled to the fold's size). Not needed for 'class_weight', which adds no rows.
+    """
+    if method not in ('smote', 'random'):
+        raise ValueError(f"Fold resampling needs an oversampling method (smote or random), got '{method}'")
+    if dtype not in RESAMPLING_DTYPES:
+        raise ValueError(f"Unknown resampling dtype '{dtype}' (choose from {', '.join(RESAMPLING_DTYPES)})")
+    X, y = np.asarray(X), np.asarray(y)
+    splits = list(cv.split(X, y))
+    fold_targets = []
+    for train_idx, _ in splits:
+        cap = None if max_synthetic is None else max_synthetic * len(train_idx) // len(X)
+        fold_targets.append(oversampling_targets(y[train_idx], cap)[0])
+
+    # One matrix for all folds; only one fold's training rows are copied out at a time
+    X_out, y_out = _allocate(X, y, sum(sum(targets.values()) for targets in fold_targets), dtype)
+    folds = []
+    start = len(X)
+    for (train_idx, test_idx), targets in zip(splits, fold_targets):
+        n_new = sum(targets.values())
+        if method == 'smote':
+            _smote_rows(X[train_idx], y[train_idx], targets, X_out, y_out, start, dtype, n_jobs, chunk_rows,
+                        SMOTE_K_NEIGHBORS, 42)
+        else:
+            _random_rows(X[train_idx], y[train_idx], targets, X_out, y_out, start, chunk_rows, 42)
+        # Same row order as resampling the fold on its own: its original rows, then the new ones
+        folds.append((np.concatenate([train_idx, np.arange(start, start + n_new)]), test_idx))
+        start += n_new
+
+    description = f"{cv!r}, method={method}, dtype={dtype}, max_synthetic={max_synthetic}"
+    report = {
+        'folds': len(folds),
+        'synthetic_rows': int(start - len(X)),
+        'rows': int(len(X_out)),
+        'output_mb': float(X_out.nbytes / 1024 / 1024)
+    }
+    return ResampledFolds(X_out, y_out, folds, description), report
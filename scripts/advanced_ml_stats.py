@@ -0,0 +1,171 @@
+"""
+Significance tests and confidence intervals for the trained models.
+
+mcnemar_matrix compares every pair of models in one pass over the stacked
+"prediction is correct" matrix: the discordant counts of all pairs come from
+two matrix products, p-values from the exact binomial distribution, and
+adjust_p_values corrects them for the number of pairs compared.
+bootstrap_metric_cis resamples the test set with one index matrix and
+evaluates each metric for every resample at once.
+"""
+import numpy as np
+from scipy.stats import binom, rankdata
+
+P_VALUE_ADJUSTMENTS = ('holm', 'bonferroni', 'fdr_bh', 'none')
+BOOTSTRAP_METRICS = ('accuracy', 'precision', 'recall', 'f1_score', 'roc_auc')
+# Resampled test rows evaluated per chunk (bounds the bootstrap's memory on large test sets)
+BOOTSTRAP_CHUNK_ELEMENTS = 2_000_000
+
+
+def adjust_p_values(p_values, method='holm'):
+    """Multiple-comparison adjusted p-values (same shape as p_values; NaN entries are ignored)"""
+    if method not in P_VALUE_ADJUSTMENTS:
+        raise ValueError(f"Unknown p-value adjustment '{method}' (choose from {', '.join(P_VALUE_ADJUSTMENTS)})")
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full(p_values.shape, np.nan)
+    mask = ~np.isnan(p_values)
+    p = p_values[mask]
+    m = len(p)
+    if method == 'none' or m == 0:
+        adjusted[mask] = p
+        return adjusted
+    if method == 'bonferroni':
+        adjusted[mask] = np.minimum(1.0, p * m)
+        return adjusted
+
+    order = np.argsort(p, kind='mergesort')
+    ranked = p[order]
+    if method == 'holm':
+        # Step-down: p_(i) * (m - i + 1), made monotone non-decreasing
+        stepped = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    else:
+        # Benjamini-Hochberg step-up: p_(i) * m / i, made monotone from the largest down
+        stepped = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    result = np.empty(m)
+    result[order] = np.minimum(1.0, stepped)
+    adjusted[mask] = result
+    return adjusted
+
+
+def mcnemar_exact_p(b, c):
+    """Two-sided exact McNemar p-value: binomial test of min(b, c) discordant pairs at 1/2"""
+    b, c = np.asarray(b), np.asarray(c)
+    n = b + c
+    p = np.minimum(1.0, 2.0 * binom.cdf(np.minimum(b, c), n, 0.5))
+    return np.where(n > 0, p, 1.0)
+
+
+def mcnemar_matrix(y_true, predictions, adjust='holm', alpha=0.05):
+    """
+    Pairwise McNemar tests between all models.
+    predictions: model id -> test-set predictions (same order as y_true).
+    Returns model ids plus (models x models) arrays: 'statistic' (continuity-corrected
+    chi-square), 'p_value' (exact), 'p_value_adjusted' (over the distinct pairs), 'significant'
+    (p_value < alpha), 'significant_adjusted' (p_value_adjusted < alpha) and the contingency counts 'both_correct', 'row_only_correct', 'col_only_correct', 'both_wrong'.
+    """
+    models = list(predictions)
+    correct = np.stack([np.asarray(predictions[m]) == np.asarray(y_true) for m in models]).astype(np.int64)
+    wrong = 1 - correct
+    both_correct = correct @ correct.T
+    row_only = correct @ wrong.T  # model i right, model j wrong
+    col_only = row_only.T
+    both_wrong = wrong @ wrong.T
+
+    discordant = row_only + col_only
+    with np.errstate(divide='ignore', invalid='ignore'):
+        statistic = np.where(discordant > 0, (np.abs(row_only - col_only) - 1) ** 2 / discordant, 0.0)
+    p_value = mcnemar_exact_p(row_only, col_only)
+
+    # Correct over the m(m-1)/2 distinct pairs, then mirror into the full matrix
+    upper = np.triu_indices(len(models), k=1)
+    adjusted = np.full(p_value.shape, np.nan)
+    adjusted[upper] = adjust_p_values(p_value[upper], adjust)
+    adjusted.T[upper] = adjusted[upper]
+    np.fill_diagonal(statistic, np.nan)
+    np.fill_diagonal(p_value, np.nan)
+    return {
+        'models': models,
+        'adjustment': adjust,
+        'alpha': alpha,
+        'statistic': statistic,
+        'p_value': p_value,
+        'p_value_adjusted': adjusted,
+        'significant': p_value < alpha,
+        'significant_adjusted': adjusted < alpha,
+        'both_correct': both_correct,
+        'row_only_correct': row_only,
+        'col_only_correct': col_only,
+        'both_wrong': both_wrong
+    }
+
+
+def _weighted_scores(y_true, y_pred, classes):
+    """Weighted precision, recall and F1 per resample; y_true/y_pred are (resamples, rows)"""
+    n = y_true.shape[1]
+    precision = np.zeros(len(y_true))
+    recall = np.zeros(len(y_true))
+    f1 = np.zeros(len(y_true))
+    for k in classes:
+        true_k = y_true == k
+        pred_k = y_pred == k
+        tp = (true_k & pred_k).sum(axis=1)
+        support = true_k.sum(axis=1)
+        predicted = pred_k.sum(axis=1)
+        weight = support / n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # zero_division=0, as in calculate_metrics
+            precision += weight * np.where(predicted > 0, tp / predicted, 0.0)
+            recall += weight * np.where(support > 0, tp / support, 0.0)
+            f1 += weight * np.where(support + predicted > 0, 2 * tp / (support + predicted), 0.0)
+    return precision, recall, f1
+
+
+def _roc_auc(y_true, scores):
+    """Binary ROC AUC per resample (Mann-Whitney rank statistic, ties averaged); NaN for one-class samples"""
+    ranks = rankdata(scores, axis=1)
+    positives = y_true == 1
+    n_pos = positives.sum(axis=1)
+    n_neg = y_true.shape[1] - n_pos
+    with np.errstate(divide='ignore', invalid='ignore'):
+        auc = ((ranks * positives).sum(axis=1) - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+    return np.where((n_pos > 0) & (n_neg > 0), auc, np.nan)
+
+
+def bootstrap_metric_cis(y_true, y_pred, y_pred_proba=None, n_resamples=1000, confidence=0.95, seed=42):
+    """
+    Percentile bootstrap confidence intervals of the calculate_metrics metrics over the test set.
+    Returns metric -> {'lower', 'upper'}; roc_auc only for binary targets with probabilities.
+    """
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    n = len(y_true)
+    classes = np.unique(np.concatenate([y_true, y_pred]))
+    binary_scores = None
+    if y_pred_proba is not None and np.asarray(y_pred_proba).ndim == 2 and np.asarray(y_pred_proba).shape[1] == 2:
+        binary_scores = np.asarray(y_pred_proba)[:, 1]
+
+    rng = np.random.RandomState(seed)
+    chunk = max(1, BOOTSTRAP_CHUNK_ELEMENTS // max(n, 1))
+    values = {metric: [] for metric in BOOTSTRAP_METRICS}
+    for start in range(0, n_resamples, chunk):
+        idx = rng.randint(0, n, size=(min(chunk, n_resamples - start), n))
+        true_b, pred_b = y_true[idx], y_pred[idx]
+        values['accuracy'].append((true_b == pred_b).mean(axis=1))
+        precision, recall, f1 = _weighted_scores(true_b, pred_b, classes)
+        values['precision'].append(precision)
+        values['recall'].append(recall)
+        values['f1_score'].append(f1)
+        if binary_scores is not None:
+            values['roc_auc'].append(_roc_auc(true_b, binary_scores[idx]))
+
+    tail = (1 - confidence) / 2 * 100
+    intervals = {}
+    for metric, chunks in values.items():
+        if not chunks:
+            continue
+        samples = np.concatenate(chunks)
+        if np.all(np.isnan(samples)):
+            continue
+        lower, upper = np.nanpercentile(samples, [tail, 100 - tail])
+        intervals[metric] = {'lower': float(lower), 'upper': float(upper)}
+    return intervals
@@ -1,25 +1,258 @@
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV, StratifiedKFold
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.linear_model import LogisticRegression
+from sklearn.base import clone
+from sklearn.model_selection import (
+    train_test_split, GridSearchCV, RandomizedSearchCV, StratifiedKFold, ParameterGrid, ParameterSampler
+)
+from sklearn.preprocessing import LabelEncoder
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.neighbors import KNeighborsClassifier
-from sklearn.svm import SVC
+from sklearn.svm import SVC, LinearSVC
+from sklearn.kernel_approximation import Nystroem
+from sklearn.pipeline import Pipeline
 from sklearn.ensemble import AdaBoostClassifier
+import xgboost as xgb
 from xgboost import XGBClassifier
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
-from imblearn.over_sampling import SMOTE
-import shap
 import json
-import sys
 import os
 import joblib
 import warnings
+import hashlib
+import tempfile
+import time
+from collections import OrderedDict
+from advanced_ml_inference import (
+    BootcampInferencePredictor, BootcampPreprocessor, PREPROCESSOR_FILE, resolve_n_jobs, dump_artifact, load_artifact,
+    model_filename, save_model_artifact, xgb_training_params
+)
+# shap itself is training-only; advanced_ml_explain imports it lazily inside its explainers
+from advanced_ml_explain import SHAP_BUDGETS, explainer_filename, make_explainer_artifact, shap_importance
+from advanced_ml_ingest import DEFAULT_CHUNK_ROWS, iter_chunks
+from advanced_ml_profiling import StageTimer
+from advanced_ml_resampling import RESAMPLING_DEFAULTS, class_weight_params, resample_cv_folds, resample_training_set
+from advanced_ml_stats import bootstrap_metric_cis, mcnemar_matrix
 warnings.filterwarnings('ignore')
 
-class AdvancedMLBootcampPredictor:
-    def __init__(self):
+
+# Slowest to fastest to tune; leftover cores from the CPU budget go to the front of this list
+ALGORITHM_COST_ORDER = ('svm', 'xgboost', 'adaboost', 'knn', 'logistic', 'decision_tree')
+# Estimators that multithread internally, so their cores are split between folds and threads
+THREADED_ALGORITHMS = ('xgboost',)
+# Preprocessed datasets kept in memory per predictor (each holds the full scaled splits)
+DATASET_CACHE_SIZE = 2
+# hyperparameter_tuning search strategies: exhaustive grid, fixed-budget random sampling, successive halving
+SEARCH_STRATEGIES = ('grid', 'random', 'halving')
+# Candidates sampled per algorithm by the 'random' strategy
+DEFAULT_SEARCH_ITER = 10
+# Neighbor index for the tuned KNN model: 'auto' times every tree/leaf size below, 'brute' keeps a full scan
+KNN_INDEXES = ('auto', 'kd_tree', 'ball_tree', 'brute')
+KNN_LEAF_SIZES = (16, 32, 64)
+# Training rows used as queries when timing the index candidates
+KNN_INDEX_QUERY_ROWS = 2000
+# Kernel SVC fits grow quadratically with rows; from this many training rows the SVM is a
+# linear SVM (optionally on Nystroem RBF features) calibrated once on the validation split
+SVM_APPROXIMATE_MIN_ROWS = 10000
+SVM_NYSTROEM_COMPONENTS = 100
+DEFAULT_BOOTSTRAP_SAMPLES = 1000
+# update_saved_models continues these from the saved models instead of searching and refitting:
+# logistic regression as log-loss SGD from the saved coefficients, XGBoost with more boosting rounds
+INCREMENTAL_ALGORITHMS = ('logistic', 'xgboost')
+INCREMENTAL_SGD_ETA0 = 0.01
+INCREMENTAL_XGB_ROUNDS = 50
+# Share of a new cohort held out to score the saved and the updated models
+INCREMENTAL_HOLDOUT = 0.05
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Content hash of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_search_strategy(spec):
+    """
+    Parse a --search_strategy value: one strategy for every algorithm ('random'),
+    or per-algorithm overrides ('svm=halving,xgboost=random', the rest use grid)
+    """
+    if not spec or '=' not in spec:
+        strategy = spec or 'grid'
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search strategy '{strategy}' (choose from {', '.join(SEARCH_STRATEGIES)})")
+        return strategy
+    strategies = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        alg_id, strategy = [part.strip() for part in item.split('=', 1)]
+        strategies[alg_id] = parse_search_strategy(strategy)
+    return strategies
+
+
+def _fit_and_score_fold(estimator, params, X, y, train_idx, test_idx, scorer):
+    """Score one (candidate, fold) pair like GridSearchCV does; failed fits score NaN"""
+    model = clone(estimator).set_params(**params)
+    try:
+        model.fit(X[train_idx], y[train_idx])
+        return float(scorer(model, X[test_idx], y[test_idx]))
+    except Exception as e:
+        warnings.warn(f"Fit failed for {params}: {e}")
+        return np.nan
+
+
+class CVScoreCache:
+    """
+    Disk-backed cache of cross-validation fold scores and refitted best estimators.
+    Entries are keyed by a hash of the training arrays (so dataset, preprocessing and
+    SMOTE are all covered), the estimator and its fixed params, the CV splitter, the
+    scoring and the sklearn/xgboost/numpy versions; within an entry scores are stored per (param set, fold). Least recently
+    used files are deleted once the directory grows past max_bytes. Entries are joblib
+    pickles, so the cache directory must be trusted.
+    """
+
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def search_key(self, algorithm_id, model, X, y, cv, scoring):
+        """Identify one tuning problem; the estimator's n_jobs is left out as it does not change scores"""
+        import sklearn
+
+        digest = hashlib.sha256()
+        for array in (np.ascontiguousarray(X), np.ascontiguousarray(y)):
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            digest.update(array.tobytes())
+        fixed_params = {k: v for k, v in model.get_params().items() if k != 'n_jobs'}
+        # Library versions: a new sklearn, xgboost or numpy may score or pickle estimators differently
+        versions = [sklearn.__version__, xgb.__version__, np.__version__]
+        digest.update(json.dumps([type(model).__name__, fixed_params, repr(cv), scoring, versions],
+                                 sort_keys=True, default=str).encode())
+        return f"{algorithm_id}_{digest.hexdigest()[:32]}"
+
+    @staticmethod
+    def params_key(params):
+        return json.dumps(params, sort_keys=True, default=str)
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def _load(self, name):
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            value = joblib.load(path)
+            os.utime(path)  # mark as recently used
+            return value
+        except Exception as e:
+            # Truncated, corrupt or written by other library versions: drop it and count a miss
+            print(f"  CV cache: discarding unreadable entry {name} ({type(e).__name__}: {e})")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _store(self, name, value):
+        # Write-then-rename so concurrent training processes never read a partial file
+        path = self._path(name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def get_scores(self, key):
+        """{(params_key, fold): score} already computed for this tuning problem"""
+        return self._load(f"{key}.scores.joblib") or {}
+
+    def put_scores(self, key, scores):
+        merged = self.get_scores(key)
+        merged.update(scores)
+        self._store(f"{key}.scores.joblib", merged)
+
+    def _estimator_name(self, key, params):
+        return f"{key}.{hashlib.sha256(self.params_key(params).encode()).hexdigest()[:16]}.model.joblib"
+
+    def get_estimator(self, key, params):
+        return self._load(self._estimator_name(key, params))
+
+    def put_estimator(self, key, params, estimator):
+        self._store(self._estimator_name(key, params), estimator)
+
+    def total_bytes(self):
+        return sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.is_file())
+
+    def _evict(self):
+        entries = [entry for entry in os.scandir(self.cache_dir)
+                   if entry.is_file() and not entry.name.endswith('.tmp')]
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+            if total <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                pass
+
+
+def _run_training_job(predictor, alg_id, split, plan, tuning, timer_options):
+    """Worker-process entry point: train one algorithm and return its output, captured logs and stage timings"""
+    import io
+    import contextlib
+    from joblib import parallel_config
+    from threadpoolctl import threadpool_limits
+    
+    log_buffer = io.StringIO()
+    # Stage timings are taken in this process and merged by the parent
+    predictor.timer = StageTimer(**timer_options)
+    # Folds run on threads inside the worker: a nested process pool per algorithm oversubscribes badly
+    with contextlib.redirect_stdout(log_buffer), threadpool_limits(limits=plan['estimator_threads'] or 1), \
+            parallel_config(backend='threading'):
+        output = predictor.train_algorithm(alg_id, *split, **plan, **tuning)
+    return output, log_buffer.getvalue(), predictor.timer.algorithms.get(alg_id, {})
+
+
+class _CohortDataIter(xgb.DataIter):
+    """Training rows of a cohort, chunk by chunk, as an external-memory XGBoost data source"""
+
+    def __init__(self, chunks, cache_prefix):
+        self._chunks = chunks  # returns a fresh (X, y, held_out) chunk generator
+        self._iterator = chunks()
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        for X, y, held_out in self._iterator:
+            if (~held_out).any():
+                input_data(data=X[~held_out], label=y[~held_out])
+                return 1
+        return 0
+
+    def reset(self):
+        self._iterator = self._chunks()
+
+
+class AdvancedMLBootcampPredictor(BootcampInferencePredictor):
+    def __init__(self, model_registry=None, cv_cache=None):
+        super().__init__(model_registry)
+        # Optional CVScoreCache: reuse fold scores and best estimators across training runs
+        self.cv_cache = cv_cache
+        # Sample budgets and workers for SHAP (see advanced_ml_explain.SHAP_BUDGETS)
+        self.shap_budgets = dict(SHAP_BUDGETS)
+        # How use_smote rebalances the training split (see advanced_ml_resampling.RESAMPLING_DEFAULTS)
+        self.resampling = dict(RESAMPLING_DEFAULTS)
+        # Neighbor index the tuned KNN model is saved with (see KNN_INDEXES and tune_neighbor_index)
+        self.knn_index = 'auto'
+        # Test-set resamples for bootstrap confidence intervals of the metrics
+        self.bootstrap_samples = DEFAULT_BOOTSTRAP_SAMPLES
+        # Per-stage wall/CPU time and peak memory; train_and_evaluate_advanced starts a fresh one
+        self.timer = StageTimer(memory=None)
         # Define algorithms with hyperparameter grids
         self.algorithms = {
             'logistic': {
@@ -46,12 +279,15 @@ class AdvancedMLBootcampPredictor:
                 }
             },
             'svm': {
-                'model': SVC(random_state=42, probability=True),
+                'model': SVC(random_state=42),
                 'params': {
                     'C': [0.1, 1, 10, 100],
                     'kernel': ['rbf', 'linear'],
                     'gamma': ['scale', 'auto']
-                }
+                },
+                # Platt scaling (an internal 5-fold CV) only for the refitted best model, not every candidate
+                'final_params': {'probability': True},
+                'path': 'kernel_svc'
             },
             'adaboost': {
                 'model': AdaBoostClassifier(random_state=42, algorithm='SAMME'),
@@ -70,19 +306,33 @@ class AdvancedMLBootcampPredictor:
             }
         }
         
-        self.algorithm_names = {
-            'logistic': 'Logistic Regression',
-            'decision_tree': 'Decision Tree',
-            'knn': 'k-Nearest Neighbors',
-            'svm': 'Support Vector Machine',
-            'adaboost': 'AdaBoost',
-            'xgboost': 'XGBoost'
+        # Variants used instead of self.algorithms once the training split has min_rows rows
+        self.large_data_algorithms = {
+            'svm': {
+                'min_rows': SVM_APPROXIMATE_MIN_ROWS,
+                'model': Pipeline([
+                    ('features', Nystroem(n_components=SVM_NYSTROEM_COMPONENTS, random_state=42)),
+                    ('svm', LinearSVC(random_state=42, dual=False))
+                ]),
+                'params': [
+                    {'features': ['passthrough'], 'svm__C': [0.1, 1, 10, 100]},  # linear kernel
+                    {'svm__C': [0.1, 1, 10, 100]}  # approximate RBF kernel (gamma = 1 / n_features)
+                ],
+                # LinearSVC has no probabilities: sigmoid-calibrate the best model on the validation split
+                'calibration': 'sigmoid',
+                'path': 'approximate'
+            }
         }
         
-        self.scaler = StandardScaler()
         self.label_encoder = LabelEncoder()
-        self.column_encoders = {}
-        self.feature_names = []
+        # Preprocessed splits by (file sha256, target column, split seed), see prepare_dataset
+        self.dataset_cache = OrderedDict()
+    
+    def __getstate__(self):
+        # Training workers get their split explicitly; do not ship every cached dataset along
+        state = super().__getstate__()
+        state['dataset_cache'] = OrderedDict()
+        return state
         
     def _counts_dict(self, labels):
         """Return counts as a JSON-serializable dict with native int keys/values."""
@@ -90,14 +340,14 @@ class AdvancedMLBootcampPredictor:
         # Ensure native Python ints for JSON compatibility (avoid numpy.int64 keys)
         return {int(u): int(c) for u, c in zip(uniq.tolist(), counts.tolist())}
 
-    def stratified_split(self, X, y, train_size=0.9, val_size=0.05, test_size=0.05):
+    def stratified_split(self, X, y, train_size=0.9, val_size=0.05, test_size=0.05, random_state=42):
         """
         Perform stratified splitting: 90% train, 5% validation, 5% test
         Maintains unbalanced class ratio across all splits
         """
         # First split: separate test set (5%)
         X_temp, X_test, y_temp, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=42, stratify=y
+            X, y, test_size=test_size, random_state=random_state, stratify=y
         )
         
         # Second split: separate train and validation from remaining data
@@ -105,13 +355,28 @@ class AdvancedMLBootcampPredictor:
         val_size_adjusted = val_size / (train_size + val_size)
         
         X_train, X_val, y_train, y_val = train_test_split(
-            X_temp, y_temp, test_size=val_size_adjusted, random_state=42, stratify=y_temp
+            X_temp, y_temp, test_size=val_size_adjusted, random_state=random_state, stratify=y_temp
         )
         
         return X_train, X_val, X_test, y_train, y_val, y_test
     
-    def preprocess_bootcamp_data(self, df, target_column='class', use_smote=False):
+    def preprocess_bootcamp_data(self, df, target_column='class', use_smote=False, split_seed=42):
         """Preprocess bootcamp dataset with specific attribute handling"""
+        X_train_scaled, X_val_scaled, X_test_scaled, y_train, y_val, y_test = self._encode_split_scale(
+            df, target_column, split_seed
+        )
+        if use_smote:
+            X_train_scaled, y_train = self.apply_smote(X_train_scaled, y_train)
+        return X_train_scaled, X_val_scaled, X_test_scaled, y_train, y_val, y_test
+    
+    def apply_smote(self, X_train, y_train):
+        """Oversample the minority class of the training split only (SMOTE, see advanced_ml_resampling)"""
+        options = {key: value for key, value in self.resampling.items() if key != 'in_folds'}
+        X_resampled, y_resampled, _ = resample_training_set(X_train, y_train, **dict(options, method='smote'))
+        return X_resampled, y_resampled
+    
+    def _encode_split_scale(self, df, target_column, split_seed):
+        """Fit the preprocessor, split and scale; everything before the (optional) SMOTE step"""
         # Separate features and target
         X = df.drop(columns=[target_column])
         y = df[target_column]
@@ -119,88 +384,339 @@ class AdvancedMLBootcampPredictor:
         # Store original feature names
         self.feature_names = X.columns.tolist()
         
-        # Handle categorical variables with proper encoding
-        categorical_columns = X.select_dtypes(include=['object']).columns
-        
-        for col in categorical_columns:
-            if col == 'gender':
-                # Handle gender: L=0, P=1
-                X[col] = X[col].map({'L': 0, 'P': 1})
-            elif col == 'grades':
-                # Handle education levels with proper ordering
-                education_order = {'SMA': 1, 'D3': 2, 'S1': 3, 'S2': 4, 'S3': 5}
-                X[col] = X[col].map(education_order).fillna(1)  # Default to SMA if unknown
-                # Use label encoding for majoring (text field)
-                le = LabelEncoder()
-                X[col] = le.fit_transform(X[col].astype(str))
-                self.column_encoders[col] = le
-            else:
-                # General categorical encoding
-                le = LabelEncoder()
-                X[col] = le.fit_transform(X[col].astype(str))
-                self.column_encoders[col] = le
-        
-        # Validate score constraints
-        if 'logical_test_score' in X.columns:
-            X['logical_test_score'] = X['logical_test_score'].clip(lower=60)
-        if 'tech_interview_grades' in X.columns:
-            X['tech_interview_grades'] = X['tech_interview_grades'].clip(lower=65)
-
-        # Handle missing values (NaN) in numeric columns prevents classifier errors
-        numeric_columns = X.select_dtypes(include=['number']).columns
-        if len(numeric_columns) > 0:
-            from sklearn.impute import SimpleImputer
-            imputer = SimpleImputer(strategy='mean')
-            X[numeric_columns] = imputer.fit_transform(X[numeric_columns])
-        
-        # Encode target variable (pass/failed)
+        # Encode categoricals, clip scores and mean-impute with the same fitted
+        # preprocessor that inference loads (see BootcampPreprocessor)
+        self.preprocessor = BootcampPreprocessor()
+        X_encoded = self.preprocessor.fit_encode(X)
+        
+        # Encode target variable (pass/failed); a fresh encoder so cached datasets keep theirs
+        self.label_encoder = LabelEncoder()
         y_encoded = self.label_encoder.fit_transform(y)
+        self.preprocessor.label_encoder = self.label_encoder
         
         # Stratified split: 90% train, 5% validation, 5% test
-        X_train, X_val, X_test, y_train, y_val, y_test = self.stratified_split(X, y_encoded)
-        
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_val_scaled = self.scaler.transform(X_val)
-        X_test_scaled = self.scaler.transform(X_test)
+        X_train, X_val, X_test, y_train, y_val, y_test = self.stratified_split(
+            X_encoded, y_encoded, random_state=split_seed
+        )
         
-        # Apply SMOTE only to training data if requested
-        if use_smote:
-            smote = SMOTE(random_state=42)
-            X_train_scaled, y_train = smote.fit_resample(X_train_scaled, y_train)
-            
+        # Scale features (statistics from the training split only)
+        X_train_scaled = self.preprocessor.fit_scaler(X_train)
+        X_val_scaled = self.preprocessor.scale(X_val)
+        X_test_scaled = self.preprocessor.scale(X_test)
         return X_train_scaled, X_val_scaled, X_test_scaled, y_train, y_val, y_test
     
-    def hyperparameter_tuning(self, algorithm_id, X_train, y_train, X_val, y_val):
-        """Perform Grid Search hyperparameter tuning using validation set"""
-        algorithm_config = self.algorithms[algorithm_id]
+    def _stream_encode_split_scale(self, data_path, target_column, split_seed, chunk_rows):
+        """
+        _encode_split_scale over a file read in chunks, never holding the raw data as one DataFrame:
+          1. fit the encodings and imputation means chunk by chunk and label-encode the target
+          2. split row indices (the same split stratified_split makes of the full matrix)
+          3. encode each chunk straight into its rows of the train/val/test matrices,
+             fitting the scaler on the training rows as they arrive, then scale in place
+        Peak memory is the three output matrices plus one chunk. Returns the splits and the file shape.
+        """
+        preprocessor = BootcampPreprocessor()
+        target_codes, target_levels = [], []
+        n_columns = None
+        for chunk in iter_chunks(data_path, chunk_rows):
+            if target_column not in chunk.columns:
+                raise ValueError(f"Target column '{target_column}' not found in {os.path.basename(data_path)}")
+            n_columns = chunk.shape[1]
+            preprocessor.partial_fit(chunk.drop(columns=[target_column]))
+            codes, levels = pd.factorize(chunk[target_column])
+            if (codes < 0).any():
+                raise ValueError(f"Target column '{target_column}' has missing values")
+            target_codes.append(codes)
+            target_levels.append(np.asarray(levels))
+        if n_columns is None:
+            raise ValueError(f"{os.path.basename(data_path)} has no rows")
+        preprocessor.finish_fit()
+        self.feature_names = preprocessor.feature_names
+        self.preprocessor = preprocessor
+        
+        # Encode target variable (pass/failed) as LabelEncoder would: codes into the sorted classes
+        self.label_encoder = LabelEncoder()
+        self.label_encoder.classes_ = np.unique(np.concatenate(target_levels))
+        y_encoded = np.concatenate([np.searchsorted(self.label_encoder.classes_, levels)[codes]
+                                    for codes, levels in zip(target_codes, target_levels)])
+        del target_codes, target_levels
+        preprocessor.label_encoder = self.label_encoder
+        
+        # Stratified split: 90% train, 5% validation, 5% test (of row indices; y alone decides it)
+        n_rows = len(y_encoded)
+        train_idx, val_idx, test_idx, y_train, y_val, y_test = self.stratified_split(
+            np.arange(n_rows), y_encoded, random_state=split_seed
+        )
+        split_of = np.empty(n_rows, dtype=np.int8)
+        row_in_split = np.empty(n_rows, dtype=np.int64)
+        outputs = []
+        for s, idx in enumerate((train_idx, val_idx, test_idx)):
+            split_of[idx] = s
+            row_in_split[idx] = np.arange(len(idx))
+            outputs.append(np.empty((len(idx), len(self.feature_names))))
+        del train_idx, val_idx, test_idx
+        
+        start = 0
+        for chunk in iter_chunks(data_path, chunk_rows):
+            X_chunk = preprocessor.encode(chunk)
+            stop = start + len(X_chunk)
+            for s, X_out in enumerate(outputs):
+                rows = split_of[start:stop] == s
+                X_out[row_in_split[start:stop][rows]] = X_chunk[rows]
+                if s == 0 and rows.any():
+                    # Scaler statistics from the training split only (a chunk may hold val/test rows alone)
+                    preprocessor.partial_fit_scaler(X_chunk[rows])
+            start = stop
+        
+        # Scale features in place
+        for X_out in outputs:
+            X_out -= preprocessor.mean_
+            X_out /= preprocessor.scale_
+        X_train_scaled, X_val_scaled, X_test_scaled = outputs
+        return (X_train_scaled, X_val_scaled, X_test_scaled, y_train, y_val, y_test), (n_rows, n_columns)
+    
+    def prepare_dataset(self, data_path, target_column='class', split_seed=42, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Load, encode, split and scale a CSV or Parquet file once, reading it chunk_rows rows at
+        a time (see _stream_encode_split_scale). The result is cached by file content hash,
+        target column and split seed, so the baseline and SMOTE phases (and any later run on
+        the same upload) start straight from the scaled train/val/test arrays.
+        """
+        with self.timer.stage('hash_file'):
+            key = (file_sha256(data_path), target_column, split_seed)
+        dataset = self.dataset_cache.get(key)
+        if dataset is not None:
+            self.dataset_cache.move_to_end(key)
+            print(f"Reusing preprocessed dataset (sha256 {key[0][:12]}, target '{target_column}', seed {split_seed})")
+            return dataset
+        
+        with self.timer.stage('preprocess'):
+            split, shape = self._stream_encode_split_scale(data_path, target_column, split_seed, chunk_rows)
+        print(f"Dataset loaded: {shape[0]} rows, {shape[1]} columns")
+        dataset = {
+            'key': key,
+            'shape': shape,
+            'feature_names': self.feature_names,
+            'preprocessor': self.preprocessor,
+            'label_encoder': self.label_encoder,
+            'split': split
+        }
+        self.dataset_cache[key] = dataset
+        while len(self.dataset_cache) > DATASET_CACHE_SIZE:
+            self.dataset_cache.popitem(last=False)
+        return dataset
+    
+    def search_strategy_for(self, algorithm_id, search_strategy=None):
+        """Resolve the strategy for one algorithm from a single name or a per-algorithm dict (default grid)"""
+        if isinstance(search_strategy, dict):
+            return search_strategy.get(algorithm_id, 'grid')
+        return search_strategy or 'grid'
+    
+    def algorithm_config(self, algorithm_id, n_rows):
+        """Search config for algorithm_id, switching to its large-data variant from min_rows training rows"""
+        large = self.large_data_algorithms.get(algorithm_id)
+        if large is not None and n_rows >= large['min_rows']:
+            return large
+        return self.algorithms[algorithm_id]
+    
+    def training_path(self, algorithm_id, n_rows, best_params=None):
+        """Which estimator/calibration path trained algorithm_id (None for algorithms with a single path)"""
+        config = self.algorithm_config(algorithm_id, n_rows)
+        if 'path' not in config:
+            return None
+        path = {'path': config['path'], 'train_rows': int(n_rows), 'min_rows': self.large_data_algorithms[algorithm_id]['min_rows']}
+        if config['path'] == 'approximate':
+            linear = (best_params or {}).get('features') == 'passthrough'
+            path['estimator'] = 'LinearSVC' if linear else f'Nystroem({SVM_NYSTROEM_COMPONENTS}) + LinearSVC'
+            path['calibration'] = f"{config['calibration']} on validation split"
+        else:
+            path['estimator'] = type(config['model']).__name__
+            path['calibration'] = 'Platt scaling (internal 5-fold CV, best model only)'
+        return path
+    
+    def cross_validator(self):
+        """CV splitter of the hyperparameter searches (and of resample_cv_folds)"""
+        return StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    
+    def hyperparameter_tuning(self, algorithm_id, X_train, y_train, X_val, y_val, n_jobs=-1, estimator_threads=None,
+                              search='grid', n_iter=DEFAULT_SEARCH_ITER, class_weight=False, cv_folds=None,
+                              train_rows=None):
+        """
+        Perform hyperparameter tuning using validation set
+        n_jobs: search workers; estimator_threads: the estimator's own n_jobs (e.g. XGBoost threads)
+        search: 'grid' (exhaustive GridSearchCV), 'random' (n_iter sampled candidates) or
+                'halving' (successive halving over training samples)
+        class_weight: weight classes inversely to their frequency instead of resampling (class_weight_params)
+        cv_folds: ResampledFolds to search on (folds resampled separately, see resample_cv_folds);
+                  the best candidate is then fitted on X_train, y_train
+        train_rows: real training rows before resampling, which pick the large-data variant (default len(X_train))
+        """
+        algorithm_config = self.algorithm_config(algorithm_id, len(X_train) if train_rows is None else train_rows)
         model = algorithm_config['model']
         param_grid = algorithm_config['params']
+        final_params = algorithm_config.get('final_params', {})
+        # With final_params or resampled folds the search only ranks candidates; the best one is fitted once below
+        refit = not final_params and cv_folds is None
+        if estimator_threads is not None and 'n_jobs' in model.get_params():
+            model = clone(model).set_params(n_jobs=estimator_threads)
+        if class_weight:
+            model = clone(model).set_params(**class_weight_params(model, y_train))
         
         # Use StratifiedKFold for cross-validation
-        cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-        
-        # Grid Search with cross-validation
-        grid_search = GridSearchCV(
-            model, param_grid, cv=cv, scoring='f1_weighted', 
-            n_jobs=-1, verbose=0
-        )
+        cv = self.cross_validator()
+        X_search, y_search = X_train, y_train
+        if cv_folds is not None:
+            # Same splits, but every fold trains on its own resampled rows (computed once for all candidates)
+            cv, X_search, y_search = cv_folds, cv_folds.X, cv_folds.y
         
-        grid_search.fit(X_train, y_train)
+        if search == 'random':
+            # Fixed budget of candidates; never more than the grid holds
+            n_candidates = len(ParameterGrid(param_grid))
+            grid_search = RandomizedSearchCV(
+                model, param_grid, n_iter=min(n_iter, n_candidates), cv=cv, scoring='f1_weighted',
+                n_jobs=n_jobs, random_state=42, refit=refit, verbose=0
+            )
+        elif search == 'halving':
+            # Every candidate starts on a small sample; only the best third advance to 3x more rows
+            from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+            from sklearn.model_selection import HalvingGridSearchCV
+            grid_search = HalvingGridSearchCV(
+                model, param_grid, cv=cv, scoring='f1_weighted', factor=3,
+                n_jobs=n_jobs, random_state=42, refit=refit, verbose=0
+            )
+        elif search == 'grid':
+            # Grid Search with cross-validation
+            grid_search = GridSearchCV(
+                model, param_grid, cv=cv, scoring='f1_weighted', 
+                n_jobs=n_jobs, refit=refit, verbose=0
+            )
+        else:
+            raise ValueError(f"Unknown search strategy '{search}' (choose from {', '.join(SEARCH_STRATEGIES)})")
+
+        if self.cv_cache is not None and search in ('grid', 'random'):
+            # Halving picks later rounds from earlier scores, so only fixed candidate lists are cached
+            candidates = list(ParameterGrid(param_grid) if search == 'grid' else
+                              ParameterSampler(param_grid, grid_search.n_iter, random_state=42))
+            best_model, best_params, mean_val_score, std_val_score = self._cached_search(
+                algorithm_id, model, candidates, cv, X_search, y_search, n_jobs, final_params,
+                refit_data=None if cv_folds is None else (X_train, y_train)
+            )
+        else:
+            grid_search.fit(X_search, y_search)
+            
+            # Get CV results for the best estimator
+            best_index = grid_search.best_index_
+            best_params = grid_search.best_params_
+            std_val_score = grid_search.cv_results_['std_test_score'][best_index]
+            mean_val_score = grid_search.cv_results_['mean_test_score'][best_index]
+            if refit:
+                best_model = grid_search.best_estimator_
+            else:
+                best_model = clone(model).set_params(**best_params, **final_params).fit(X_train, y_train)
         
-        # Validate on validation set
+        if 'calibration' in algorithm_config:
+            # Single calibration pass on the validation split (the training rows were used for fitting)
+            from sklearn.calibration import CalibratedClassifierCV
+            best_model = CalibratedClassifierCV(best_model, method=algorithm_config['calibration'], cv='prefit')
+            best_model.fit(X_val, y_val)
         
-        # Get CV results for the best estimator
-        best_index = grid_search.best_index_
-        std_val_score = grid_search.cv_results_['std_test_score'][best_index]
-        mean_val_score = grid_search.cv_results_['mean_test_score'][best_index]
+        return best_model, best_params, mean_val_score, std_val_score
+
+    def _cached_search(self, algorithm_id, model, candidates, cv, X_train, y_train, n_jobs, final_params=None,
+                       refit_data=None):
+        """
+        Same selection as GridSearchCV/RandomizedSearchCV over candidates, but fold scores and the
+        refitted best estimator come from self.cv_cache when available; only missing folds are fitted.
+        final_params are set on the refitted best estimator only (see 'final_params' in self.algorithms);
+        refit_data: (X, y) to fit the best estimator on instead of X_train, y_train
+        """
+        from joblib import Parallel, delayed
+        from sklearn.metrics import get_scorer
+
+        X_train = np.asarray(X_train)
+        y_train = np.asarray(y_train)
+        key = self.cv_cache.search_key(algorithm_id, model, X_train, y_train, cv, 'f1_weighted')
+        folds = list(cv.split(X_train, y_train))
+        cached = self.cv_cache.get_scores(key)
+        missing = [(self.cv_cache.params_key(params), params, fold)
+                   for params in candidates for fold in range(len(folds))
+                   if (self.cv_cache.params_key(params), fold) not in cached]
+
+        if missing:
+            scorer = get_scorer('f1_weighted')
+            scores = Parallel(n_jobs=n_jobs)(
+                delayed(_fit_and_score_fold)(model, params, X_train, y_train, *folds[fold], scorer)
+                for _, params, fold in missing
+            )
+            computed = {(params_key, fold): score for (params_key, _, fold), score in zip(missing, scores)}
+            self.cv_cache.put_scores(key, computed)
+            cached.update(computed)
+        print(f"  CV cache: {len(candidates) * len(folds) - len(missing)}/{len(candidates) * len(folds)} fold scores reused")
+
+        # Mean/std and ranking exactly as BaseSearchCV computes them (NaN ranks last, ties go to the first)
+        fold_scores = np.array([[cached[(self.cv_cache.params_key(params), fold)] for fold in range(len(folds))]
+                                for params in candidates])
+        means = np.average(fold_scores, axis=1)
+        stds = np.sqrt(np.average((fold_scores - means[:, np.newaxis]) ** 2, axis=1))
+        if np.all(np.isnan(means)):
+            best_index = 0
+        else:
+            best_index = int(np.argmax(np.nan_to_num(means, nan=np.nanmin(means) - 1)))
+        best_params = candidates[best_index]
+
+        best_model = self.cv_cache.get_estimator(key, best_params)
+        if best_model is None:
+            best_model = clone(model).set_params(**best_params, **(final_params or {})).fit(*(refit_data or (X_train, y_train)))
+            self.cv_cache.put_estimator(key, best_params, best_model)
+        return best_model, best_params, means[best_index], stds[best_index]
+
+    def tune_neighbor_index(self, model, X_train, y_train, index='auto'):
+        """
+        Refit a tuned KNN model on an explicit spatial index. Searches stay exact, so predictions
+        are unchanged (up to the order of equidistant neighbors); only query speed differs.
+        index: 'kd_tree' or 'ball_tree' tries KNN_LEAF_SIZES for that tree, 'auto' both trees,
+        'brute' a full scan. The candidate answering KNN_INDEX_QUERY_ROWS training rows fastest wins.
+        Returns (refitted model, stats for the results)
+        """
+        if index not in KNN_INDEXES:
+            raise ValueError(f"Unknown KNN index '{index}' (choose from {', '.join(KNN_INDEXES)})")
+        if index == 'brute':
+            candidates = [('brute', None)]
+        else:
+            trees = ('kd_tree', 'ball_tree') if index == 'auto' else (index,)
+            candidates = [(tree, leaf_size) for tree in trees for leaf_size in KNN_LEAF_SIZES]
         
-        return grid_search.best_estimator_, grid_search.best_params_, mean_val_score, std_val_score
+        rng = np.random.RandomState(42)
+        X_query = X_train[rng.choice(len(X_train), min(KNN_INDEX_QUERY_ROWS, len(X_train)), replace=False)]
+        best, timings = None, []
+        for tree, leaf_size in candidates:
+            candidate = clone(model).set_params(algorithm=tree, **({'leaf_size': leaf_size} if leaf_size else {}))
+            try:
+                start = time.perf_counter()
+                candidate.fit(X_train, y_train)
+                build_s = time.perf_counter() - start
+                start = time.perf_counter()
+                candidate.kneighbors(X_query)
+                query_s = time.perf_counter() - start
+            except ValueError:
+                continue  # metric not supported by this tree
+            timings.append({'algorithm': tree, 'leaf_size': leaf_size, 'build_s': build_s,
+                            'query_ms_per_row': query_s * 1000 / len(X_query)})
+            if best is None or query_s < best[1]:
+                best = (candidate, query_s, timings[-1])
+        if best is None:
+            raise ValueError(f"No {index} index supports metric '{model.metric}'")
+        return best[0], dict(best[2], candidates=timings)
     
     def calculate_feature_importance(self, model, algorithm_id):
         """Calculate feature importance based on algorithm type"""
         importance = None
         
+        # Calibrated or pipeline-wrapped models: use the underlying estimator when it sees the raw features
+        if hasattr(model, 'calibrated_classifiers_'):
+            model = model.calibrated_classifiers_[0].estimator
+        if isinstance(model, Pipeline) and all(step == 'passthrough' for _, step in model.steps[:-1]):
+            model = model.steps[-1][1]
+        
         if hasattr(model, 'feature_importances_'):
             # Tree-based models and boosting algorithms
             importance = model.feature_importances_
@@ -217,72 +733,87 @@ class AdvancedMLBootcampPredictor:
         
         return {}
     
-    def calculate_shap_values(self, model, X_test, algorithm_id, max_samples=100):
-        """Calculate SHAP values for model interpretability"""
+    def feature_importance_note(self, model):
+        """Why calculate_feature_importance found no per-feature importance for model"""
+        if hasattr(model, 'calibrated_classifiers_'):
+            model = model.calibrated_classifiers_[0].estimator
+        if isinstance(model, Pipeline) and any(step != 'passthrough' for _, step in model.steps[:-1]):
+            return ("Unavailable: the model's weights apply to transformed features "
+                    f"({', '.join(type(step).__name__ for _, step in model.steps[:-1] if step != 'passthrough')}), "
+                    "not the input features; see shap_importance")
+        return f"Unavailable: {type(model).__name__} has no per-feature importance; see shap_importance"
+    
+    def calculate_shap_values(self, model, X_test, algorithm_id, X_background=None):
+        """
+        SHAP feature importance (mean |SHAP| on test rows) plus timing stats; see advanced_ml_explain
+        for the explainer used per algorithm. X_background: training data for linear/kernel explainers.
+        """
+        start = time.perf_counter()
         try:
-            # Limit samples for computational efficiency
-            X_sample = X_test[:max_samples] if len(X_test) > max_samples else X_test
-            
-            if algorithm_id in ['decision_tree', 'adaboost', 'xgboost']:
-                # Tree-based explainer
-                explainer = shap.TreeExplainer(model)
-                shap_values = explainer.shap_values(X_sample)
-            else:
-                # Kernel explainer for other models
-                explainer = shap.KernelExplainer(model.predict_proba, X_sample[:10])  # Use small background
-                shap_values = explainer.shap_values(X_sample[:20])  # Limit for efficiency
-            
-            # Handle multi-class case
-            if isinstance(shap_values, list):
-                shap_values = shap_values[1]  # Use positive class for binary classification
-            
-            # Calculate mean absolute SHAP values for feature importance
-            mean_shap = np.mean(np.abs(shap_values), axis=0)
-            shap_importance = dict(zip(self.feature_names, mean_shap))
-            shap_importance = dict(sorted(shap_importance.items(), key=lambda x: x[1], reverse=True))
-            
-            return shap_importance
-            
+            return shap_importance(
+                model, algorithm_id, X_test, X_test if X_background is None else X_background,
+                self.feature_names, self.shap_budgets
+            )
+        except Exception as e:
+            # Keep training going, but report the failure instead of an unexplained empty result
+            print(f"SHAP calculation failed for {algorithm_id}: {type(e).__name__}: {str(e)}")
+            return {}, {'explainer': None, 'error': f"{type(e).__name__}: {str(e)}",
+                        'seconds': time.perf_counter() - start}
+    
+    def save_explainer(self, model, algorithm_id, X_background, save_dir):
+        """Persist the model's SHAP explainer next to it so predictions can be explained per row"""
+        path = os.path.join(save_dir, explainer_filename(algorithm_id))
+        try:
+            artifact = make_explainer_artifact(model, algorithm_id, X_background, self.feature_names, self.shap_budgets)
+            dump_artifact(artifact, path)
         except Exception as e:
-            print(f"SHAP calculation failed for {algorithm_id}: {str(e)}")
-            return {}
+            # A stale explainer from an earlier model would explain the wrong predictions
+            if os.path.exists(path):
+                os.remove(path)
+            print(f"Saving SHAP explainer failed for {algorithm_id}: {type(e).__name__}: {str(e)}")
     
     def mcnemar_test(self, y_true, y_pred1, y_pred2):
-        """Perform McNemar test to compare two algorithms"""
+        """Perform McNemar test to compare two algorithms (exact binomial p-value)"""
         try:
-            # Create contingency table
-            correct1 = (y_pred1 == y_true)
-            correct2 = (y_pred2 == y_true)
-            
-            # McNemar table: [both_correct, model1_correct_model2_wrong, 
-            #                 model1_wrong_model2_correct, both_wrong]
-            both_correct = np.sum(correct1 & correct2)
-            model1_only = np.sum(correct1 & ~correct2)
-            model2_only = np.sum(~correct1 & correct2)
-            both_wrong = np.sum(~correct1 & ~correct2)
-            
-            # McNemar test statistic
-            if model1_only + model2_only > 0:
-                mcnemar_stat = ((abs(model1_only - model2_only) - 1) ** 2) / (model1_only + model2_only)
-                p_value = 1 - np.exp(-mcnemar_stat / 2)  # Approximation
-            else:
-                mcnemar_stat = 0
-                p_value = 1.0
-            
-            return {
-                'statistic': mcnemar_stat,
-                'p_value': p_value,
-                'significant': p_value < 0.05,
-                'contingency': {
-                    'both_correct': both_correct,
-                    'model1_only_correct': model1_only,
-                    'model2_only_correct': model2_only,
-                    'both_wrong': both_wrong
-                }
-            }
+            pair = mcnemar_matrix(y_true, {'model1': y_pred1, 'model2': y_pred2}, adjust='none')
+            return self._mcnemar_pair(pair, 0, 1)
         except Exception as e:
             return {'error': str(e)}
     
+    def _mcnemar_pair(self, matrix, i, j):
+        """One pair of a mcnemar_matrix result in the statistical_analysis format"""
+        return {
+            'statistic': float(matrix['statistic'][i, j]),
+            'p_value': float(matrix['p_value'][i, j]),
+            'p_value_adjusted': float(matrix['p_value_adjusted'][i, j]),
+            'adjustment': matrix['adjustment'],
+            'significant': bool(matrix['significant'][i, j]),
+            'significant_adjusted': bool(matrix['significant_adjusted'][i, j]),
+            'contingency': {
+                'both_correct': int(matrix['both_correct'][i, j]),
+                'model1_only_correct': int(matrix['row_only_correct'][i, j]),
+                'model2_only_correct': int(matrix['col_only_correct'][i, j]),
+                'both_wrong': int(matrix['both_wrong'][i, j])
+            }
+        }
+    
+    def _pairwise_summary(self, matrix):
+        """JSON-ready mcnemar_matrix result (None on the diagonal)"""
+        def as_lists(values, cast):
+            return [[None if i == j else cast(values[i, j]) for j in range(len(matrix['models']))]
+                    for i in range(len(matrix['models']))]
+        
+        return {
+            'models': matrix['models'],
+            'adjustment': matrix['adjustment'],
+            'alpha': matrix['alpha'],
+            'statistic': as_lists(matrix['statistic'], float),
+            'p_value': as_lists(matrix['p_value'], float),
+            'p_value_adjusted': as_lists(matrix['p_value_adjusted'], float),
+            'significant': as_lists(matrix['significant'], bool),
+            'significant_adjusted': as_lists(matrix['significant_adjusted'], bool)
+        }
+    
     def calculate_metrics(self, y_true, y_pred, y_pred_proba):
         """Calculate comprehensive evaluation metrics"""
         metrics = {
@@ -294,102 +825,285 @@ class AdvancedMLBootcampPredictor:
         }
         return metrics
     
-    def train_and_evaluate_advanced(self, data_path, target_column, selected_algorithms, use_smote=False, save_dir=None):
-        """Advanced training with hyperparameter tuning, feature importance, and SHAP"""
-        try:
-            # Load data
-            df = pd.read_csv(data_path)
-            print(f"Dataset loaded: {df.shape[0]} rows, {df.shape[1]} columns")
+    def plan_cpu_budget(self, algorithms, cpu_budget=None, n_folds=5):
+        """
+        Split a global CPU budget across concurrently tuned algorithms.
+        Without a budget every algorithm runs in turn with GridSearchCV n_jobs=-1 (legacy behaviour).
+        With one, up to cpu_budget algorithms run at once; each gets an equal share of cores
+        (leftovers go to the slowest algorithms first), used for GridSearchCV folds, and
+        internally threaded estimators (XGBoost) turn any share beyond n_folds into their own threads.
+        """
+        if cpu_budget is None:
+            return {
+                'budget': None,
+                'concurrent': 1,
+                'algorithms': {alg_id: {'n_jobs': -1, 'estimator_threads': None} for alg_id in algorithms}
+            }
+        
+        budget = resolve_n_jobs(cpu_budget)
+        concurrent = max(1, min(len(algorithms), budget))
+        shares = {alg_id: max(1, budget // concurrent) for alg_id in algorithms}
+        if len(algorithms) <= budget:
+            leftover = budget - sum(shares.values())
+            by_cost = sorted(algorithms, key=lambda a: ALGORITHM_COST_ORDER.index(a) if a in ALGORITHM_COST_ORDER else len(ALGORITHM_COST_ORDER))
+            for alg_id in by_cost[:leftover]:
+                shares[alg_id] += 1
+        
+        plan = {}
+        for alg_id, share in shares.items():
+            if alg_id in THREADED_ALGORITHMS:
+                grid_jobs = min(share, n_folds)
+                plan[alg_id] = {'n_jobs': grid_jobs, 'estimator_threads': max(1, share // grid_jobs)}
+            else:
+                plan[alg_id] = {'n_jobs': share, 'estimator_threads': 1}
+        return {'budget': budget, 'concurrent': concurrent, 'algorithms': plan}
+    
+    def train_algorithm(self, alg_id, X_train, y_train, X_val, y_val, X_test, y_test, n_jobs=-1, estimator_threads=None,
+                        search='grid', n_iter=DEFAULT_SEARCH_ITER, class_weight=False, cv_folds=None, train_rows=None):
+        """
+        Tune, evaluate and explain one algorithm; returns (result, test predictions, best model)
+        train_rows: training rows before resampling (default len(X_train), see hyperparameter_tuning)
+        """
+        if train_rows is None:
+            train_rows = len(X_train)
+        print(f"\nTraining {self.algorithm_names[alg_id]} with hyperparameter tuning ({search} search)...")
+        timer = self.timer
+        
+        with timer.stage('total', alg_id):
+            # Hyperparameter tuning
+            with timer.stage('tuning', alg_id):
+                best_model, best_params, val_score, val_std = self.hyperparameter_tuning(
+                    alg_id, X_train, y_train, X_val, y_val, n_jobs=n_jobs, estimator_threads=estimator_threads,
+                    search=search, n_iter=n_iter, class_weight=class_weight, cv_folds=cv_folds,
+                    train_rows=train_rows
+                )
             
-            # Preprocess data with stratified splitting
-            X_train, X_val, X_test, y_train, y_val, y_test = self.preprocess_bootcamp_data(
-                df, target_column, use_smote
-            )
+            # Rebuild the KNN model on the fastest neighbor index before it is evaluated and saved
+            neighbor_index = None
+            if alg_id == 'knn':
+                with timer.stage('neighbor_index', alg_id):
+                    best_model, neighbor_index = self.tune_neighbor_index(best_model, X_train, y_train, self.knn_index)
+                leaf = f"leaf size {neighbor_index['leaf_size']}, " if neighbor_index['leaf_size'] else ""
+                print(f"  Neighbor index: {neighbor_index['algorithm']} ({leaf}{neighbor_index['query_ms_per_row']:.3f} ms/query)")
+            
+            # Final evaluation on test set
+            with timer.stage('predict', alg_id):
+                y_pred = best_model.predict(X_test)
+                y_pred_proba = best_model.predict_proba(X_test)
+            
+            # Calculate metrics (with percentile bootstrap confidence intervals over the test set)
+            with timer.stage('metrics', alg_id):
+                metrics = self.calculate_metrics(y_test, y_pred, y_pred_proba)
+            metrics_ci = None
+            if self.bootstrap_samples:
+                with timer.stage('bootstrap', alg_id):
+                    metrics_ci = bootstrap_metric_cis(y_test, y_pred, y_pred_proba, n_resamples=self.bootstrap_samples)
+            
+            # Feature importance analysis
+            with timer.stage('feature_importance', alg_id):
+                feature_importance = self.calculate_feature_importance(best_model, alg_id)
+            
+            # SHAP analysis (background drawn from the training split)
+            with timer.stage('shap', alg_id):
+                shap_values_importance, shap_stats = self.calculate_shap_values(
+                    best_model, X_test, alg_id, X_background=X_train
+                )
+        print(f"  SHAP ({shap_stats['explainer'] or 'failed'}): {shap_stats['seconds']:.2f}s")
+        
+        # Store comprehensive results
+        result = {
+            'name': self.algorithm_names[alg_id],
+            'metrics': metrics,
+            'metrics_ci': metrics_ci,
+            'cv_stats': {
+                'mean_f1': float(val_score),
+                'std_f1': float(val_std)
+            },
+            'best_params': best_params,
+            'validation_score': val_score,
+            'feature_importance': feature_importance,
+            'shap_importance': shap_values_importance,
+            'shap_stats': shap_stats,
+            'type': 'conventional' if alg_id in ['logistic', 'decision_tree', 'knn', 'svm'] else 'boosting'
+        }
+        
+        if neighbor_index is not None:
+            result['neighbor_index'] = neighbor_index
+        if not feature_importance:
+            result['feature_importance_note'] = self.feature_importance_note(best_model)
+        training_path = self.training_path(alg_id, train_rows, best_params)
+        if training_path is not None:
+            result['training_path'] = training_path
+            print(f"  Training path: {training_path['path']} ({training_path['estimator']}, {training_path['calibration']})")
+        
+        print(f"  Best params: {best_params}")
+        print(f"  Validation F1: {val_score:.4f}")
+        print(f"  Test Accuracy: {metrics['accuracy']:.4f}")
+        print(f"  Test Accuracy: {metrics['accuracy']:.4f}")
+        print(f"  Test F1: {metrics['f1_score']:.4f}")
+        
+        return result, y_pred, best_model
+    
+    def _train_algorithms_concurrently(self, algorithms, split, cpu_plan, tuning):
+        """Run train_algorithm for each algorithm in its own worker process under cpu_plan"""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        print(f"\nTuning {len(algorithms)} algorithms concurrently (CPU budget {cpu_plan['budget']}, "
+              f"{cpu_plan['concurrent']} at a time)")
+        # spawn, not fork: forked children inherit the parent's BLAS/OpenMP thread state
+        spawn = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=cpu_plan['concurrent'], mp_context=spawn) as executor:
+            futures = {
+                alg_id: executor.submit(
+                    _run_training_job, self, alg_id, split, cpu_plan['algorithms'][alg_id], tuning[alg_id],
+                    self.timer.options()
+                )
+                for alg_id in algorithms
+            }
+            trained = {}
+            for alg_id in algorithms:
+                output, logs, timings = futures[alg_id].result()
+                # Replay worker logs in selection order so they do not interleave
+                print(logs, end='')
+                self.timer.merge_algorithm(alg_id, timings)
+                trained[alg_id] = output
+        return trained
+    
+    def train_and_evaluate_advanced(self, data_path, target_column, selected_algorithms, use_smote=False, save_dir=None,
+                                    cpu_budget=None, search_strategy=None, search_iter=DEFAULT_SEARCH_ITER, dataset=None,
+                                    shap_budgets=None, memory_tracking='rss', profile_stage=None, profile_dir='profiles',
+                                    profiler='cprofile',
+                                    artifact_format='joblib', knn_index='auto', p_adjust='holm',
+                                    bootstrap_samples=DEFAULT_BOOTSTRAP_SAMPLES, chunk_rows=DEFAULT_CHUNK_ROWS, resampling=None):
+        """
+        Advanced training with hyperparameter tuning, feature importance, and SHAP
+        cpu_budget: total cores to use; tunes algorithms concurrently (see plan_cpu_budget)
+        search_strategy: 'grid' (default), 'random' or 'halving', or a dict of per-algorithm strategies
+        search_iter: candidates per algorithm for the 'random' strategy
+        dataset: output of prepare_dataset to train on instead of loading data_path again
+        shap_budgets: overrides for SHAP_BUDGETS (explain_rows, background_rows, n_jobs, ...)
+        memory_tracking: peak memory per stage, 'rss', 'tracemalloc' or None (see advanced_ml_profiling)
+        profile_stage: stage to profile, e.g. 'resampling' or 'xgboost.tuning'; written to profile_dir
+        profiler: 'cprofile' (.prof for pstats/snakeviz) or 'pyinstrument' (.html, needs pyinstrument)
+        artifact_format: how save_dir models are stored, 'joblib' or 'mmap' (see advanced_ml_inference.ARTIFACT_FORMATS)
+        knn_index: neighbor index for the KNN model (see KNN_INDEXES)
+        p_adjust: multiple-comparison adjustment of the pairwise McNemar p-values (see advanced_ml_stats)
+        bootstrap_samples: test-set resamples for the metric confidence intervals (0 disables them)
+        chunk_rows: rows read at a time while loading data_path (see advanced_ml_ingest)
+        resampling: overrides for RESAMPLING_DEFAULTS (method, dtype, max_synthetic, n_jobs, in_folds) used with use_smote
+        """
+        self.shap_budgets = dict(SHAP_BUDGETS, **(shap_budgets or {}))
+        self.resampling = dict(RESAMPLING_DEFAULTS, **(resampling or {}))
+        self.knn_index = knn_index
+        self.bootstrap_samples = bootstrap_samples
+        try:
+            self.timer = timer = StageTimer(memory=memory_tracking, profile_stage=profile_stage, profile_dir=profile_dir,
+                                            profiler=profiler)
+            # Load and preprocess data with stratified splitting (cached across calls)
+            if dataset is None:
+                dataset = self.prepare_dataset(data_path, target_column, chunk_rows=chunk_rows)
+            self.preprocessor = dataset['preprocessor']
+            self.label_encoder = dataset['label_encoder']
+            self.feature_names = dataset['feature_names']
+            dataset_shape = dataset['shape']
+            X_train, X_val, X_test, y_train, y_val, y_test = dataset['split']
             
             print(f"Stratified split completed:")
-            print(f"  Training: {X_train.shape[0]} samples ({X_train.shape[0]/df.shape[0]*100:.1f}%)")
-            print(f"  Validation: {X_val.shape[0]} samples ({X_val.shape[0]/df.shape[0]*100:.1f}%)")
-            print(f"  Test: {X_test.shape[0]} samples ({X_test.shape[0]/df.shape[0]*100:.1f}%)")
+            print(f"  Training: {X_train.shape[0]} samples ({X_train.shape[0]/dataset_shape[0]*100:.1f}%)")
+            print(f"  Validation: {X_val.shape[0]} samples ({X_val.shape[0]/dataset_shape[0]*100:.1f}%)")
+            print(f"  Test: {X_test.shape[0]} samples ({X_test.shape[0]/dataset_shape[0]*100:.1f}%)")
             
+            resampling_report = None
+            cv_folds = None
+            # Real training rows: synthetic rows must not switch algorithms to their large-data variants
+            train_rows = len(X_train)
             if use_smote:
-                print(f"SMOTE applied to training set: {X_train.shape[0]} samples")
+                options = {key: value for key, value in self.resampling.items() if key != 'in_folds'}
+                in_folds = self.resampling['in_folds'] and options['method'] != 'class_weight'
+                if in_folds:
+                    # Resample each CV fold's training rows once, so validation folds see no synthetic
+                    # copies of themselves; every candidate of every algorithm reuses these folds
+                    with timer.stage('resampling_folds'):
+                        cv_folds, folds_report = resample_cv_folds(X_train, y_train, self.cross_validator(), **options)
+                    folds_report.update({key: timer.stages['resampling_folds'][key] for key in ('wall_s', 'cpu_s', 'peak_mb')})
+                    print(f"{options['method']} resampling applied inside {folds_report['folds']} CV folds: "
+                          f"{folds_report['synthetic_rows']} synthetic rows ({folds_report['wall_s']:.2f}s)")
+                # Rebalance the training data only (SMOTE by default, see advanced_ml_resampling);
+                # with in_folds the best candidates are fitted on it
+                with timer.stage('resampling'):
+                    X_train, y_train, resampling_report = resample_training_set(X_train, y_train, **options)
+                resampling_report.update({key: timer.stages['resampling'][key] for key in ('wall_s', 'cpu_s', 'peak_mb')})
+                resampling_report['in_folds'] = folds_report if in_folds else None
+                peak = resampling_report['peak_mb']
+                print(f"{resampling_report['method']} resampling applied to training set: {X_train.shape[0]} samples "
+                      f"({resampling_report['synthetic_rows']} synthetic, {resampling_report['wall_s']:.2f}s"
+                      + (f", peak {peak:.0f} MB)" if peak is not None else ")"))
+            class_weight = use_smote and self.resampling['method'] == 'class_weight'
             
             if save_dir:
                 os.makedirs(save_dir, exist_ok=True)
-                joblib.dump(self.scaler, os.path.join(save_dir, 'scaler.joblib'))
-                joblib.dump(self.label_encoder, os.path.join(save_dir, 'label_encoder.joblib'))
-                joblib.dump(self.column_encoders, os.path.join(save_dir, 'column_encoders.joblib'))
+                with timer.stage('save_preprocessor'):
+                    dump_artifact(self.preprocessor, os.path.join(save_dir, PREPROCESSOR_FILE))
             
             results = {}
             predictions = {}  # Store predictions for McNemar test
             
-            # Train each selected algorithm
-            for alg_id in selected_algorithms:
-                if alg_id not in self.algorithms:
-                    continue
-                    
-                print(f"\nTraining {self.algorithm_names[alg_id]} with hyperparameter tuning...")
-                
-                # Hyperparameter tuning
-                best_model, best_params, val_score, val_std = self.hyperparameter_tuning(
-                    alg_id, X_train, y_train, X_val, y_val
-                )
-                
-                # Final evaluation on test set
-                y_pred = best_model.predict(X_test)
-                y_pred_proba = best_model.predict_proba(X_test)
-                
+            # Train each selected algorithm (concurrently when a CPU budget is given)
+            algorithms = [alg_id for alg_id in selected_algorithms if alg_id in self.algorithms]
+            cpu_plan = self.plan_cpu_budget(algorithms, cpu_budget)
+            split = (X_train, y_train, X_val, y_val, X_test, y_test)
+            tuning = {alg_id: {'search': self.search_strategy_for(alg_id, search_strategy), 'n_iter': search_iter,
+                               'class_weight': class_weight, 'cv_folds': cv_folds, 'train_rows': train_rows}
+                      for alg_id in algorithms}
+            if class_weight:
+                # Estimators without class weights (KNN, AdaBoost) train on the unweighted data
+                resampling_report['weighted_algorithms'] = [
+                    alg_id for alg_id in algorithms
+                    if class_weight_params(self.algorithm_config(alg_id, train_rows)['model'], y_train)
+                ]
+            with timer.stage('training'):
+                # A plan running one algorithm at a time needs no worker processes
+                if cpu_budget is None or len(algorithms) <= 1 or cpu_plan['concurrent'] == 1:
+                    trained = {alg_id: self.train_algorithm(alg_id, *split, **cpu_plan['algorithms'][alg_id], **tuning[alg_id])
+                               for alg_id in algorithms}
+                else:
+                    trained = self._train_algorithms_concurrently(algorithms, split, cpu_plan, tuning)
+            
+            for alg_id in algorithms:
+                result, y_pred, best_model = trained[alg_id]
+                results[alg_id] = result
                 # Store predictions for statistical tests
                 predictions[alg_id] = y_pred
                 
-                # Calculate metrics
-                metrics = self.calculate_metrics(y_test, y_pred, y_pred_proba)
-                
-                # Feature importance analysis
-                feature_importance = self.calculate_feature_importance(best_model, alg_id)
-                
-                # SHAP analysis
-                shap_importance = self.calculate_shap_values(best_model, X_test, alg_id)
-                
-                # Store comprehensive results
-                results[alg_id] = {
-                    'name': self.algorithm_names[alg_id],
-                    'metrics': metrics,
-                    'cv_stats': {
-                        'mean_f1': float(val_score),
-                        'std_f1': float(val_std)
-                    },
-                    'best_params': best_params,
-                    'validation_score': val_score,
-                    'feature_importance': feature_importance,
-                    'shap_importance': shap_importance,
-                    'type': 'conventional' if alg_id in ['logistic', 'decision_tree', 'knn', 'svm'] else 'boosting'
-                }
-                
-                print(f"  Best params: {best_params}")
-                print(f"  Validation F1: {val_score:.4f}")
-                print(f"  Test Accuracy: {metrics['accuracy']:.4f}")
-                print(f"  Test Accuracy: {metrics['accuracy']:.4f}")
-                print(f"  Test F1: {metrics['f1_score']:.4f}")
-                
                 if save_dir:
-                    joblib.dump(best_model, os.path.join(save_dir, f'{alg_id}.joblib'))
+                    with timer.stage('save_model', alg_id):
+                        save_model_artifact(best_model, save_dir, alg_id, artifact_format)
+                    with timer.stage('save_explainer', alg_id):
+                        self.save_explainer(best_model, alg_id, X_train, save_dir)
             
             conventional_algs = [alg for alg in selected_algorithms if alg in ['logistic', 'decision_tree', 'knn', 'svm']]
             boosting_algs = [alg for alg in selected_algorithms if alg in ['adaboost', 'xgboost']]
             
             statistical_comparisons = {}
+            pairwise_mcnemar = None
             
-            # McNemar tests between algorithm groups
-            if len(conventional_algs) > 0 and len(boosting_algs) > 0:
-                print(f"\nPerforming McNemar statistical tests...")
+            # McNemar tests between every pair of trained models in one vectorized pass,
+            # exact p-values adjusted for the number of pairs
+            if len(predictions) > 1:
+                with timer.stage('statistics'):
+                    matrix = mcnemar_matrix(y_test, predictions, adjust=p_adjust)
+                pairwise_mcnemar = self._pairwise_summary(matrix)
+                model_index = {alg_id: i for i, alg_id in enumerate(matrix['models'])}
+            
+            # Conventional vs boosting pairs, as reported in statistical_analysis
+            if len(conventional_algs) > 0 and len(boosting_algs) > 0 and pairwise_mcnemar is not None:
+                print(f"\nPerforming McNemar statistical tests ({p_adjust} adjustment over {len(predictions)} models)...")
                 
                 for conv_alg in conventional_algs:
                     for boost_alg in boosting_algs:
                         if conv_alg in predictions and boost_alg in predictions:
-                            mcnemar_result = self.mcnemar_test(
-                                y_test, predictions[conv_alg], predictions[boost_alg]
-                            )
+                            mcnemar_result = self._mcnemar_pair(matrix, model_index[conv_alg], model_index[boost_alg])
                             
                             comparison_key = f"{conv_alg}_vs_{boost_alg}"
                             statistical_comparisons[comparison_key] = {
@@ -399,11 +1113,14 @@ class AdvancedMLBootcampPredictor:
                             }
                             
                             significance = "significant" if mcnemar_result.get('significant', False) else "not significant"
-                            print(f"  {self.algorithm_names[conv_alg]} vs {self.algorithm_names[boost_alg]}: {significance} (p={mcnemar_result.get('p_value', 'N/A'):.4f})")
+                            adjusted = "significant" if mcnemar_result.get('significant_adjusted', False) else "not significant"
+                            print(f"  {self.algorithm_names[conv_alg]} vs {self.algorithm_names[boost_alg]}: {significance} "
+                                  f"(p={mcnemar_result['p_value']:.4f}); {adjusted} after adjustment "
+                                  f"(p={mcnemar_result['p_value_adjusted']:.4f})")
             
             # Add comprehensive metadata
             results['metadata'] = {
-                'dataset_shape': df.shape,
+                'dataset_shape': dataset_shape,
                 'train_shape': X_train.shape,
                 'validation_shape': X_val.shape,
                 'test_shape': X_test.shape,
@@ -411,6 +1128,12 @@ class AdvancedMLBootcampPredictor:
                 'target_classes': len(np.unique(y_test)),
                 'algorithms_trained': len(selected_algorithms),
                 'feature_names': self.feature_names,
+                'cpu_plan': cpu_plan,
+                'search_strategy': {alg_id: tuning[alg_id]['search'] for alg_id in algorithms},
+                'timings': timer.as_dict(),
+                'pairwise_mcnemar': pairwise_mcnemar,
+                'artifact_format': artifact_format if save_dir else None,
+                'resampling': resampling_report,
                 'class_distribution': {
                     'train': self._counts_dict(y_train),
                     'test': self._counts_dict(y_test)
@@ -426,159 +1149,237 @@ class AdvancedMLBootcampPredictor:
             print(f"Error during advanced training: {str(e)}")
             return {'error': str(e)}
 
-    def load_artifacts(self, load_dir):
-        """Load models and preprocessors"""
-        self.scaler = joblib.load(os.path.join(load_dir, 'scaler.joblib'))
-        self.label_encoder = joblib.load(os.path.join(load_dir, 'label_encoder.joblib'))
-        self.column_encoders = joblib.load(os.path.join(load_dir, 'column_encoders.joblib'))
-        return self
-
-    def predict_new_data(self, data_dict, model_ids, models_dir='saved_models'):
+    def _cohort_chunks(self, data_path, target_column, chunk_rows, holdout):
         """
-        Predict for a single participant
-        data_dict: dictionary of feature values
-        model_ids: list of algorithm names to use
+        Yield (X, y, held_out) per chunk of a new cohort, transformed with the saved preprocessor.
+        held_out marks the evaluation rows; it is seeded per chunk so every pass holds out the same rows.
         """
-        import pandas as pd
-        
-        # Convert single dict to DataFrame
-        df = pd.DataFrame([data_dict])
-        X_scaled = self._preprocess_inference(df)
-        
-        predictions = {}
-        for alg_id in model_ids:
-            model_path = os.path.join(models_dir, f'{alg_id}.joblib')
-            if not os.path.exists(model_path):
-                predictions[alg_id] = {'error': 'Model not found'}
-                continue
-                
-            model = joblib.load(model_path)
-            prob = 0.5
-            pred_class = "unknown"
+        for i, chunk in enumerate(iter_chunks(data_path, chunk_rows)):
+            if target_column not in chunk.columns:
+                raise ValueError(f"Target column '{target_column}' not found in {os.path.basename(data_path)}")
+            X = self.preprocessor.transform(chunk)
+            y = self.label_encoder.transform(np.asarray(chunk[target_column]))
+            yield X, y, np.random.RandomState(i).rand(len(X)) < holdout
+    
+    def _holdout_metrics(self, model, X, y):
+        """calculate_metrics on the held-out cohort rows (None when they do not hold every class)"""
+        if len(np.unique(y)) < len(self.label_encoder.classes_):
+            return None
+        return self.calculate_metrics(y, model.predict(X), model.predict_proba(X))
+    
+    def _sgd_update(self, model, chunks, train_counts, epochs):
+        """
+        Continue a logistic model with log-loss SGD, one partial_fit per chunk and epoch.
+        train_counts: training rows per encoded class in the cohort (for the L2 strength and class weights)
+        """
+        classes = np.arange(len(self.label_encoder.classes_))
+        if not isinstance(model, SGDClassifier):
+            # Start from the saved coefficients, with the saved model's L2 strength (C) over this cohort
+            # and its class weights; partial_fit cannot compute 'balanced' itself, so the cohort's
+            # balanced weights are passed explicitly
+            class_weight = model.class_weight
+            if class_weight == 'balanced':
+                class_weight = {int(cls): float(train_counts.sum() / (len(classes) * count))
+                                for cls, count in zip(classes, train_counts) if count > 0}
+            sgd = SGDClassifier(loss='log_loss', alpha=1.0 / (model.C * max(int(train_counts.sum()), 1)),
+                                class_weight=class_weight, learning_rate='constant', eta0=INCREMENTAL_SGD_ETA0,
+                                random_state=42)
+            sgd.coef_, sgd.intercept_ = model.coef_.copy(), model.intercept_.copy()
+            model = sgd
+        for _ in range(epochs):
+            for X, y, held_out in chunks():
+                if (~held_out).any():
+                    model.partial_fit(X[~held_out], y[~held_out], classes=classes)
+        return model
+    
+    def _boost_update(self, model, chunks, rounds):
+        """Add boosting rounds to an XGBoost model; the cohort is paged to disk, not held in memory"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            dtrain = xgb.DMatrix(_CohortDataIter(chunks, os.path.join(cache_dir, 'cohort')))
+            booster = xgb.train(xgb_training_params(model), dtrain, num_boost_round=rounds, xgb_model=model.get_booster())
+            del dtrain
+        # What XGBClassifier.fit does with the booster train() returns
+        model._Booster = booster
+        model.set_params(n_estimators=booster.num_boosted_rounds())
+        return model
+    
+    def update_saved_models(self, data_path, target_column, selected_algorithms, models_dir='saved_models',
+                            chunk_rows=DEFAULT_CHUNK_ROWS, epochs=1, xgb_rounds=INCREMENTAL_XGB_ROUNDS,
+                            holdout=INCREMENTAL_HOLDOUT, memory_tracking='rss', shap_budgets=None, keep_worse=False):
+        """
+        Incremental training on a new cohort instead of a full search and retrain: continue the
+        INCREMENTAL_ALGORITHMS models saved in models_dir on data_path, streamed chunk_rows rows at a
+        time through the saved preprocessor (its encodings and scaling stay fixed, so the models keep
+        seeing the same features). The holdout share of the cohort scores every model before and after.
+        epochs: SGD passes over the cohort for logistic; xgb_rounds: boosting rounds added to XGBoost.
+        Updated models and their SHAP explainers replace the saved ones, in the format they were saved in,
+        unless their held-out F1 is lower than the saved model's (keep_worse=True saves them anyway).
+        """
+        self.shap_budgets = dict(SHAP_BUDGETS, **(shap_budgets or {}))
+        try:
+            self.timer = timer = StageTimer(memory=memory_tracking)
+            self.preprocessor = load_artifact(os.path.join(models_dir, PREPROCESSOR_FILE))
+            self.label_encoder = self.preprocessor.label_encoder
+            self.feature_names = self.preprocessor.feature_names
+            chunks = lambda: self._cohort_chunks(data_path, target_column, chunk_rows, holdout)
             
-            try:
-                # Predict probability
-                if hasattr(model, 'predict_proba'):
-                    prob = model.predict_proba(X_scaled)[0][1] # Probability of class 1 (Pass)
-                else:
-                    # Fallback for models without proba (shouldn't happen with our config)
-                    pred = model.predict(X_scaled)[0]
-                    prob = 1.0 if pred == 1 else 0.0
+            # One pass for the held-out rows, the row count and an explainer background
+            with timer.stage('holdout'):
+                n_rows, held, X_background = 0, [], None
+                train_counts = np.zeros(len(self.label_encoder.classes_), dtype=np.int64)
+                for X, y, held_out in chunks():
+                    n_rows += len(X)
+                    held.append((X[held_out], y[held_out]))
+                    train_counts += np.bincount(y[~held_out], minlength=len(train_counts))
+                    if X_background is None:
+                        X_background = X[:self.shap_budgets['linear_background_rows']]
+                if X_background is None:
+                    raise ValueError(f"{os.path.basename(data_path)} has no rows")
+                X_hold = np.concatenate([X for X, _ in held])
+                y_hold = np.concatenate([y for _, y in held])
+                del held
+            n_train_rows = int(train_counts.sum())
+            print(f"Cohort loaded: {n_rows} rows ({n_train_rows} for training, {len(y_hold)} held out)")
+            
+            results = {}
+            for alg_id in selected_algorithms:
+                if alg_id not in INCREMENTAL_ALGORITHMS:
+                    results[alg_id] = {'error': f"{alg_id} does not support incremental training; retrain it with "
+                                                f"run_advanced_trainer.py"}
+                    continue
+                filename = model_filename(models_dir, alg_id)
+                if not os.path.exists(os.path.join(models_dir, filename)):
+                    results[alg_id] = {'error': f"No saved {alg_id} model in {models_dir}"}
+                    continue
                 
-                # Return standardized format
-                pred_label = 'pass' if prob > 0.5 else 'fail'
-                confidence = prob if prob > 0.5 else 1 - prob
+                print(f"\nUpdating {self.algorithm_names[alg_id]} incrementally...")
+                with timer.stage('total', alg_id):
+                    model = load_artifact(os.path.join(models_dir, filename))
+                    metrics_before = self._holdout_metrics(model, X_hold, y_hold)
+                    with timer.stage('update', alg_id):
+                        if alg_id == 'logistic':
+                            model = self._sgd_update(model, chunks, train_counts, epochs)
+                            update = {'method': 'sgd_log_loss', 'epochs': epochs, 'alpha': model.alpha,
+                                      'class_weight': model.class_weight}
+                        else:
+                            model = self._boost_update(model, chunks, xgb_rounds)
+                            update = {'method': 'continued_boosting', 'rounds_added': xgb_rounds,
+                                      'n_estimators': model.n_estimators}
+                    metrics = self._holdout_metrics(model, X_hold, y_hold)
+                    # Keep the saved model unless the update scores at least as well on the held-out rows
+                    # (without a comparable held-out score there is nothing to judge by, so it is saved)
+                    worse = metrics is not None and metrics_before is not None and \
+                        metrics['f1_score'] < metrics_before['f1_score']
+                    update['saved'] = not worse or keep_worse
+                    if update['saved']:
+                        with timer.stage('save_model', alg_id):
+                            save_model_artifact(model, models_dir, alg_id, 'mmap' if filename.endswith('.ubj') else 'joblib')
+                        with timer.stage('save_explainer', alg_id):
+                            self.save_explainer(model, alg_id, X_background, models_dir)
+                    else:
+                        # The update changed the loaded model in place; report the one still on disk
+                        model = load_artifact(os.path.join(models_dir, filename))
+                        print("  Held-out F1 dropped; keeping the saved model")
                 
-                predictions[alg_id] = {
-                    'prediction': pred_label,
-                    'confidence': float(confidence)
+                results[alg_id] = {
+                    'name': self.algorithm_names[alg_id],
+                    'model_type': type(model).__name__,
+                    'metrics': metrics,
+                    'metrics_before': metrics_before,
+                    'update': update,
+                    'feature_importance': self.calculate_feature_importance(model, alg_id)
                 }
-            except Exception as e:
-                predictions[alg_id] = {'error': str(e)}
-                
-        return predictions
-        
-    def _preprocess_inference(self, df):
-        """Preprocess inference data (shared between single and batch)"""
-        import pandas as pd
-        import numpy as np
-
-        # 1. Preprocess
-        # Manual mapping for ordered/specific columns
-        if 'gender' in df.columns:
-             df['gender'] = df['gender'].map({'L': 0, 'P': 1})
-        
-        if 'grades' in df.columns:
-            education_order = {'SMA': 1, 'D3': 2, 'S1': 3, 'S2': 4, 'S3': 5}
-            # Fill unknown with default (SMA=1) or handle error
-            df['grades'] = df['grades'].map(education_order).fillna(1)
+                if metrics and metrics_before:
+                    print(f"  Held-out F1: {metrics_before['f1_score']:.4f} -> {metrics['f1_score']:.4f}")
             
-        # Apply strict column encoding
-        for col, le in self.column_encoders.items():
-            if col in df.columns:
-                # Handle unseen labels carefully
-                # Vectorized map with fallback
-                def safe_transform(x):
-                    try:
-                        return le.transform([str(x)])[0]
-                    except:
-                        return 0
-                
-                # Apply safe transform
-                # Optimized: identify unique values, transform valid ones, map back
-                # For safety/simplicity in this context, valid classes check is good
-                valid_classes = set(le.classes_)
-                df[col] = df[col].astype(str).map(lambda x: le.transform([x])[0] if x in valid_classes else 0)
-
-        # Scale
-        X_aligned = pd.DataFrame(index=df.index)
-        
-        if hasattr(self.scaler, 'feature_names_in_'):
-            dataset_features = self.scaler.feature_names_in_
-        else:
-            dataset_features = df.columns
+            results['metadata'] = {
+                'rows': n_rows,
+                'train_rows': n_train_rows,
+                'holdout_rows': len(y_hold),
+                'models_dir': models_dir,
+                'feature_names': self.feature_names,
+                'timings': timer.as_dict()
+            }
+            return results
             
-        for feature in dataset_features:
-            if feature in df.columns:
-                X_aligned[feature] = df[feature]
-            else:
-                X_aligned[feature] = 0 # Missing feature
-                
-        # Fill any remaining NaNs (e.g. from missing columns)
-        X_aligned = X_aligned.fillna(0)
-                
-        return self.scaler.transform(X_aligned)
+        except Exception as e:
+            print(f"Error during incremental training: {str(e)}")
+            return {'error': str(e)}
 
-    def predict_batch(self, df, model_ids, models_dir='saved_models'):
-        """Batch prediction for DataFrame"""
-        import numpy as np
-        
-        X_scaled = self._preprocess_inference(df)
-        
-        # Initialize results structure: list of dicts (one per row)
-        # Each dict contains predictions for all models
-        batch_results = [{} for _ in range(len(df))]
-        
-        for alg_id in model_ids:
-            model_path = os.path.join(models_dir, f'{alg_id}.joblib')
-            if not os.path.exists(model_path):
-                for i in range(len(df)):
-                    batch_results[i][alg_id] = {'error': 'Model not found'}
-                continue
-                
-            model = joblib.load(model_path)
-            
-            try:
-                # Batch predict
-                if hasattr(model, 'predict_proba'):
-                    probs = model.predict_proba(X_scaled)[:, 1] # Class 1 (Pass)
-                else:
-                    preds = model.predict(X_scaled)
-                    probs = (preds == 1).astype(float)
-                
-                # Assign to results
-                for i, prob in enumerate(probs):
-                    pred_label = 'pass' if prob > 0.5 else 'fail'
-                    confidence = prob if prob > 0.5 else 1 - prob
-                    batch_results[i][alg_id] = {
-                        'prediction': pred_label,
-                        'confidence': float(confidence)
-                    }
-                    
-            except Exception as e:
-                for i in range(len(df)):
-                    batch_results[i][alg_id] = {'error': str(e)}
-                    
-        return batch_results
 
+def _run_training_phase(data_path, target_column, algorithms, train_kwargs, cv_cache=None):
+    """Worker-process entry point: one phase on a fresh predictor, returned with its captured logs"""
+    import io
+    import contextlib
 
-def main():
-    """Main function for advanced ML training"""
-    predictor = AdvancedMLBootcampPredictor()
-    
-    # Create synthetic bootcamp dataset with proper attributes
-    np.random.seed(42)
-    n_samples = 1000
+    log_buffer = io.StringIO()
+    with contextlib.redirect_stdout(log_buffer):
+        results = AdvancedMLBootcampPredictor(cv_cache=cv_cache).train_and_evaluate_advanced(
+            data_path, target_column, algorithms, **train_kwargs
+        )
+    return results, log_buffer.getvalue()
+
+
+def run_training_phases(data_path, target_column, algorithms, phases, concurrent=True, predictor=None,
+                        cpu_budget=None, cv_cache=None, **train_kwargs):
+    """
+    Run several train_and_evaluate_advanced configurations (e.g. baseline and SMOTE) on one dataset.
+    phases: {name: {'header': log line, 'use_smote': ..., 'save_dir': ...}}; returns {name: results}.
+    concurrent: every phase is an isolated job in its own worker process with a fresh predictor,
+    and a cpu_budget (all cores without one) is split evenly between them; the dataset is preprocessed once here (through
+    predictor's cache) and sent to the workers. Otherwise the phases run in turn on predictor,
+    sharing its preprocessed-dataset cache. cv_cache: CVScoreCache for predictors created here.
+    """
+    predictor = predictor or AdvancedMLBootcampPredictor(cv_cache=cv_cache)
+    if not concurrent or len(phases) <= 1:
+        outputs = {}
+        for name, phase in phases.items():
+            phase = dict(phase)
+            print(phase.pop('header', f"--- {name} ---"))
+            outputs[name] = predictor.train_and_evaluate_advanced(
+                data_path, target_column, algorithms, cpu_budget=cpu_budget, **train_kwargs, **phase
+            )
+        return outputs
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if train_kwargs.get('dataset') is None:
+        # Workers cannot see this process's dataset cache: encode and split once, ship the arrays
+        try:
+            train_kwargs['dataset'] = predictor.prepare_dataset(
+                data_path, target_column, chunk_rows=train_kwargs.get('chunk_rows', DEFAULT_CHUNK_ROWS)
+            )
+        except Exception as e:
+            print(f"Error during advanced training: {str(e)}")
+            return {name: {'error': str(e)} for name in phases}
+
+    # Split the budget (all cores without one) between the phases: each phase left at n_jobs=-1
+    # would claim every core and the phases would oversubscribe them
+    phase_budget = max(1, resolve_n_jobs(-1 if cpu_budget is None else cpu_budget) // len(phases))
+    spawn = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=len(phases), mp_context=spawn) as executor:
+        futures = {}
+        for name, phase in phases.items():
+            phase = dict(phase)
+            phase.pop('header', None)
+            futures[name] = executor.submit(
+                _run_training_phase, data_path, target_column, algorithms,
+                dict(train_kwargs, cpu_budget=phase_budget, **phase), cv_cache
+            )
+        outputs = {}
+        for name, phase in phases.items():
+            results, logs = futures[name].result()
+            # Replay each phase's logs in order so they do not interleave
+            print(phase.get('header', f"--- {name} ---"))
+            print(logs, end='')
+            outputs[name] = results
+    return outputs
+
+
+def generate_synthetic_dataset(n_samples=1000, seed=42):
+    """Synthetic bootcamp participants with the real dataset's columns and an unbalanced class"""
+    np.random.seed(seed)
     
     data = {
         'age': np.random.randint(18, 45, n_samples),
@@ -590,7 +1391,15 @@ def main():
         'class': np.random.choice(['pass', 'failed'], n_samples, p=[0.7, 0.3])  # Unbalanced
     }
     
-    df = pd.DataFrame(data)
+    return pd.DataFrame(data)
+
+
+def main():
+    """Main function for advanced ML training"""
+    predictor = AdvancedMLBootcampPredictor()
+    
+    # Create synthetic bootcamp dataset with proper attributes
+    df = generate_synthetic_dataset(1000, seed=42)
     df.to_csv('/tmp/bootcamp_participants.csv', index=False)
     
     # Test advanced training
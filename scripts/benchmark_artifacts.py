@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark saved model formats: cold load time and per-process memory.
+
+Re-saves the models of --models_dir in each artifact format (see
+advanced_ml_inference.ARTIFACT_FORMATS), then starts --processes fresh worker
+processes per format. Each worker loads every model, scores --rows rows and
+waits until all workers have done so before reading its memory, so pages
+shared through the page cache are counted once across them:
+  import_s  - time to import the estimator libraries (same for every format)
+  load_s    - time to load all models into the worker
+  rss_mb    - resident set size (shared mapped pages count in full)
+  pss_mb    - proportional set size (shared pages split between the workers)
+Requires trained models (run training with save_dir first). Prints JSON.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from advanced_ml_inference import (ARTIFACT_FORMATS, MMAP_MODE, ModelRegistry, load_artifact, model_filename,
+                                   positive_class_proba, save_model_artifact)
+
+
+def _memory_mb(path, field):
+    """A kB field of a /proc file in MB (None where unavailable)"""
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _worker(models_dir, model_ids, mmap_mode, n_rows, barrier, queue):
+    # Estimator modules first, so load_s is deserialization alone
+    start = time.perf_counter()
+    import sklearn.ensemble, sklearn.linear_model, sklearn.neighbors, sklearn.svm, sklearn.tree  # noqa: F401
+    import xgboost  # noqa: F401
+    import_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    registry = ModelRegistry(mmap_mode=mmap_mode)
+    models = {alg_id: registry.get(models_dir, model_filename(models_dir, alg_id)) for alg_id in model_ids}
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for model in models.values():
+        X = np.random.RandomState(0).randn(n_rows, model.n_features_in_)
+        positive_class_proba(model, X)
+    predict_s = time.perf_counter() - start
+
+    barrier.wait()  # every worker holds its models now
+    queue.put({
+        'import_s': import_s,
+        'load_s': load_s,
+        'predict_s': predict_s,
+        'rss_mb': _memory_mb('/proc/self/status', 'VmRSS'),
+        'pss_mb': _memory_mb('/proc/self/smaps_rollup', 'Pss')
+    })
+    barrier.wait()  # keep the mappings alive until every worker has measured
+
+
+def run_format(models_dir, model_ids, mmap_mode, n_processes, n_rows):
+    spawn = multiprocessing.get_context('spawn')
+    barrier, queue = spawn.Barrier(n_processes), spawn.Queue()
+    workers = [spawn.Process(target=_worker, args=(models_dir, model_ids, mmap_mode, n_rows, barrier, queue))
+               for _ in range(n_processes)]
+    for worker in workers:
+        worker.start()
+    samples = [queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    def mean(key):
+        values = [s[key] for s in samples if s[key] is not None]
+        return float(np.mean(values)) if values else None
+
+    pss = [s['pss_mb'] for s in samples if s['pss_mb'] is not None]
+    return {
+        'import_s': mean('import_s'),
+        'load_s': mean('load_s'),
+        'predict_s': mean('predict_s'),
+        'rss_mb': mean('rss_mb'),
+        'pss_mb': mean('pss_mb'),
+        'total_pss_mb': float(sum(pss)) if pss else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark saved model formats (load time, per-process memory)")
+    parser.add_argument("--models_dir", default="saved_models", help="Directory containing saved models")
+    parser.add_argument("--models", default="logistic,decision_tree,knn,svm,adaboost,xgboost", help="Comma-separated model IDs")
+    parser.add_argument("--processes", type=int, default=4, help="Concurrent worker processes per format")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows each worker scores after loading")
+    args = parser.parse_args()
+
+    model_ids = [m for m in (m.strip() for m in args.models.split(",")) if m and
+                 os.path.exists(os.path.join(args.models_dir, model_filename(args.models_dir, m)))]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for artifact_format in ARTIFACT_FORMATS:
+            format_dir = os.path.join(tmp_dir, artifact_format)
+            os.makedirs(format_dir)
+            for alg_id in model_ids:
+                model = load_artifact(os.path.join(args.models_dir, model_filename(args.models_dir, alg_id)))
+                save_model_artifact(model, format_dir, alg_id, artifact_format)
+            disk_bytes = sum(os.path.getsize(os.path.join(format_dir, f)) for f in os.listdir(format_dir))
+            mmap_mode = MMAP_MODE if artifact_format == 'mmap' else None
+            results.append(dict(
+                {'format': artifact_format, 'mmap_mode': mmap_mode, 'disk_mb': disk_bytes / 1024 / 1024},
+                **run_format(format_dir, model_ids, mmap_mode, args.processes, args.rows)
+            ))
+            shutil.rmtree(format_dir)
+
+    print(json.dumps({'models': model_ids, 'processes': args.processes, 'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
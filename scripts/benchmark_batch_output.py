@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch prediction output modes.
+
+For each input size, scores the same synthetic participants with the saved
+models and measures wall time and peak Python memory (tracemalloc) of:
+  rows      - predict_batch(output='rows') + json.dumps (legacy response)
+  columnar  - predict_batch(output='columnar') + json.dumps
+  ndjson    - iter_batch_records streamed to a file, one JSON line per row
+  npz       - score_batch + save_columnar to an .npz archive
+
+--n_jobs compares parallel multi-model scoring at several worker counts.
+
+Requires trained models (run training with save_dir first). Prints JSON.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from advanced_ml_inference import BootcampInferencePredictor, save_columnar
+from advanced_ml_trainer import generate_synthetic_dataset
+
+
+def run_rows(predictor, df, model_ids, models_dir, tmp_dir):
+    return len(json.dumps(predictor.predict_batch(df, model_ids, models_dir, output='rows')))
+
+
+def run_columnar(predictor, df, model_ids, models_dir, tmp_dir):
+    return len(json.dumps(predictor.predict_batch(df, model_ids, models_dir, output='columnar')))
+
+
+def run_ndjson(predictor, df, model_ids, models_dir, tmp_dir):
+    path = os.path.join(tmp_dir, 'predictions.ndjson')
+    with open(path, 'w') as f:
+        for row in predictor.iter_batch_records(df, model_ids, models_dir):
+            f.write(json.dumps(row) + '\n')
+    return os.path.getsize(path)
+
+
+def run_npz(predictor, df, model_ids, models_dir, tmp_dir):
+    path = os.path.join(tmp_dir, 'predictions.npz')
+    save_columnar(predictor.score_batch(df, model_ids, models_dir), path, 'npz')
+    return os.path.getsize(path)
+
+
+MODES = {'rows': run_rows, 'columnar': run_columnar, 'ndjson': run_ndjson, 'npz': run_npz}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch prediction output modes")
+    parser.add_argument("--models_dir", default="saved_models", help="Directory containing saved models")
+    parser.add_argument("--models", default="logistic,decision_tree,xgboost", help="Comma-separated model IDs")
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated row counts")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated output modes")
+    parser.add_argument("--n_jobs", default="1", help="Comma-separated scoring worker counts to compare")
+    parser.add_argument("--parallel_backend", default="thread", choices=["thread", "process"])
+    args = parser.parse_args()
+
+    model_ids = [m.strip() for m in args.models.split(",") if m.strip()]
+    predictor = BootcampInferencePredictor(parallel_backend=args.parallel_backend).load_artifacts(args.models_dir)
+    predictor.load_models(model_ids, args.models_dir)
+    worker_counts = [int(j) for j in args.n_jobs.split(",") if j.strip()]
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in [int(s) for s in args.sizes.split(",") if s.strip()]:
+            df = generate_synthetic_dataset(n_rows, seed=7).drop(columns=['class'])
+            for mode, n_jobs in [(m.strip(), j) for m in args.modes.split(",") if m.strip() for j in worker_counts]:
+                fn = MODES[mode]
+                predictor.n_jobs = n_jobs
+                start = time.perf_counter()
+                output_bytes = fn(predictor, df, model_ids, args.models_dir, tmp_dir)
+                wall_s = time.perf_counter() - start
+
+                # Separate run for memory: tracemalloc slows execution noticeably
+                tracemalloc.start()
+                fn(predictor, df, model_ids, args.models_dir, tmp_dir)
+                peak_bytes = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                results.append({
+                    'rows': n_rows,
+                    'mode': mode,
+                    'n_jobs': n_jobs,
+                    'wall_s': wall_s,
+                    'rows_per_s': n_rows / wall_s if wall_s > 0 else None,
+                    'peak_mb': peak_bytes / 1024 / 1024,
+                    'output_mb': output_bytes / 1024 / 1024
+                })
+
+    print(json.dumps({'models': model_ids, 'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark categorical encoding in _preprocess_inference.
+
+Compares the legacy per-row path (one LabelEncoder.transform call per value)
+with the lookup-table path used now, on synthetic majoring/grades columns at
+10k/100k/1M rows, checks both produce identical codes, and prints JSON.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+from advanced_ml_inference import build_lookup_table, encode_with_lookup
+
+MAJORS = ['Computer Science', 'Engineering', 'Mathematics', 'Business', 'Other']
+
+
+def make_encoders(seed=42):
+    """Fit encoders the way training does (majoring as text, grades as ordinal strings)"""
+    rng = np.random.default_rng(seed)
+    majoring = LabelEncoder().fit(rng.choice(MAJORS, 1000).astype(str))
+    grades = LabelEncoder().fit(np.array(['1', '2', '3', '4']))
+    return {'majoring': majoring, 'grades': grades}
+
+
+def make_frame(n_rows, seed=0):
+    """Inference frame with ~1% unseen majors to exercise the fallback"""
+    rng = np.random.default_rng(seed)
+    majoring = rng.choice(MAJORS + ['Unseen Major'], n_rows, p=[0.198] * 5 + [0.01])
+    grades = rng.choice(['1', '2', '3', '4'], n_rows)
+    return pd.DataFrame({'majoring': majoring, 'grades': grades})
+
+
+def encode_legacy(df, encoders):
+    out = {}
+    for col, le in encoders.items():
+        valid_classes = set(le.classes_)
+        out[col] = df[col].astype(str).map(lambda x: le.transform([x])[0] if x in valid_classes else 0).to_numpy()
+    return out
+
+
+def encode_vectorized(df, encoders):
+    tables = {col: build_lookup_table(le) for col, le in encoders.items()}
+    return {col: encode_with_lookup(df[col], table) for col, table in tables.items()}
+
+
+def best_of(fn, repeats):
+    timings = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inference categorical encoding")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated row counts")
+    parser.add_argument("--repeats", type=int, default=3, help="Best-of repeats for the vectorized path")
+    parser.add_argument("--legacy_max_rows", type=int, default=1000000,
+                        help="Skip the (slow) legacy path above this many rows")
+    args = parser.parse_args()
+
+    encoders = make_encoders()
+    results = []
+    for n_rows in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        df = make_frame(n_rows)
+        vec_s, vec_codes = best_of(lambda: encode_vectorized(df, encoders), args.repeats)
+        entry = {'rows': n_rows, 'vectorized_s': vec_s, 'legacy_s': None, 'speedup': None, 'identical': None}
+        if n_rows <= args.legacy_max_rows:
+            legacy_s, legacy_codes = best_of(lambda: encode_legacy(df, encoders), 1)
+            entry['legacy_s'] = legacy_s
+            entry['speedup'] = legacy_s / vec_s if vec_s > 0 else None
+            entry['identical'] = all(np.array_equal(legacy_codes[c], vec_codes[c]) for c in encoders)
+        results.append(entry)
+
+    print(json.dumps({'columns': list(encoders), 'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark KNN query cost against training set size, per neighbor index.
+
+For each training size, fits the KNN model on synthetic participants (encoded and
+scaled like training does) with each --indexes entry ('brute' full scan, or a tree
+picked by AdvancedMLBootcampPredictor.tune_neighbor_index), saves it and scores
+through BootcampInferencePredictor like prediction does:
+  build_s       - fit time (index construction; includes the leaf size search for trees)
+  single        - one-row latency p50/p99 over --queries requests
+  batch         - --batch_rows rows at each --n_jobs worker count (row-sharded queries)
+With an index, single-row latency should stay roughly flat as the training set grows.
+Prints JSON.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+from sklearn.neighbors import KNeighborsClassifier
+
+from advanced_ml_inference import BootcampInferencePredictor, BootcampPreprocessor, save_model_artifact
+from advanced_ml_trainer import AdvancedMLBootcampPredictor, generate_synthetic_dataset
+
+
+def scaled_dataset(n_rows, seed):
+    """Synthetic participants encoded and scaled with the training preprocessor"""
+    df = generate_synthetic_dataset(n_rows, seed=seed)
+    preprocessor = BootcampPreprocessor()
+    X = preprocessor.fit_scaler(preprocessor.fit_encode(df.drop(columns=['class'])))
+    return np.asarray(X), (df['class'] == 'pass').astype(int).to_numpy()
+
+
+def build_model(X, y, index, n_neighbors):
+    model = KNeighborsClassifier(n_neighbors=n_neighbors, weights='distance', metric='euclidean')
+    start = time.perf_counter()
+    if index == 'brute':
+        model.set_params(algorithm='brute').fit(X, y)
+        stats = {'algorithm': 'brute'}
+    else:
+        model, stats = AdvancedMLBootcampPredictor().tune_neighbor_index(model, X, y, index)
+        stats = {'algorithm': stats['algorithm'], 'leaf_size': stats['leaf_size']}
+    return model, dict(stats, build_s=time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KNN query cost against training set size")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated training row counts")
+    parser.add_argument("--indexes", default="brute,auto", help="Comma-separated indexes: brute, auto, kd_tree, ball_tree")
+    parser.add_argument("--n_neighbors", type=int, default=5, help="Neighbors per query")
+    parser.add_argument("--queries", type=int, default=200, help="Single-row requests timed per case")
+    parser.add_argument("--batch_rows", type=int, default=10000, help="Rows per batch request")
+    parser.add_argument("--n_jobs", default="1,-1", help="Comma-separated batch worker counts to compare")
+    args = parser.parse_args()
+
+    X_query, _ = scaled_dataset(max(args.batch_rows, args.queries), seed=7)
+    worker_counts = [int(j) for j in args.n_jobs.split(",") if j.strip()]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in [int(s) for s in args.sizes.split(",") if s.strip()]:
+            X, y = scaled_dataset(n_rows, seed=42)
+            for index in [i.strip() for i in args.indexes.split(",") if i.strip()]:
+                model, stats = build_model(X, y, index, args.n_neighbors)
+                models_dir = os.path.join(tmp_dir, f'{n_rows}_{index}')
+                os.makedirs(models_dir)
+                save_model_artifact(model, models_dir, 'knn')
+
+                predictor = BootcampInferencePredictor()
+                predictor.load_models(['knn'], models_dir)
+                timings = []
+                for i in range(args.queries):
+                    start = time.perf_counter()
+                    predictor.score_models(X_query[i:i + 1], ['knn'], models_dir)
+                    timings.append(time.perf_counter() - start)
+                timings_ms = np.asarray(timings) * 1000
+
+                batch = {}
+                for n_jobs in worker_counts:
+                    # Shard every batch across the workers (auto sharding waits for larger batches)
+                    predictor.n_jobs, predictor.shard_rows = n_jobs, -(-args.batch_rows // max(1, os.cpu_count() or 1))
+                    start = time.perf_counter()
+                    predictor.score_models(X_query[:args.batch_rows], ['knn'], models_dir)
+                    wall_s = time.perf_counter() - start
+                    batch[str(n_jobs)] = {'wall_s': wall_s, 'rows_per_s': args.batch_rows / wall_s if wall_s > 0 else None}
+
+                results.append(dict(
+                    {'rows': n_rows, 'index': index}, **stats,
+                    single={'p50_ms': float(np.percentile(timings_ms, 50)), 'p99_ms': float(np.percentile(timings_ms, 99))},
+                    batch=batch
+                ))
+
+    print(json.dumps({'n_neighbors': args.n_neighbors, 'batch_rows': args.batch_rows, 'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark training-set resampling: time and peak memory per method and training size.
+
+For each size, encodes and scales synthetic participants like training does and
+rebalances them with imblearn's SMOTE (the previous implementation) and with each
+advanced_ml_resampling configuration in --configs:
+  smote, smote_float32, smote_capped (--max_synthetic rows), random, class_weight
+Per case it reports wall and CPU seconds, peak traced allocations during the call
+(tracemalloc, so numpy buffers are counted) and the size of the resampled matrix.
+Prints JSON.
+"""
+import argparse
+import json
+
+import numpy as np
+
+from advanced_ml_inference import BootcampPreprocessor
+from advanced_ml_profiling import StageTimer
+from advanced_ml_resampling import resample_training_set
+from advanced_ml_trainer import generate_synthetic_dataset
+
+CONFIGS = {
+    'smote': {'method': 'smote'},
+    'smote_float32': {'method': 'smote', 'dtype': 'float32'},
+    'smote_capped': {'method': 'smote', 'dtype': 'float32'},  # max_synthetic from --max_synthetic
+    'random': {'method': 'random'},
+    'class_weight': {'method': 'class_weight'}
+}
+
+
+def scaled_training_set(n_rows, seed):
+    df = generate_synthetic_dataset(n_rows, seed=seed)
+    preprocessor = BootcampPreprocessor()
+    X = preprocessor.fit_scaler(preprocessor.fit_encode(df.drop(columns=['class'])))
+    return np.asarray(X), (df['class'] == 'pass').astype(int).to_numpy()
+
+
+def imblearn_smote(X, y):
+    from imblearn.over_sampling import SMOTE
+    X_resampled, y_resampled = SMOTE(random_state=42).fit_resample(X, y)
+    return X_resampled, y_resampled, {'output_mb': X_resampled.nbytes / 1024 / 1024, 'rows_after': len(X_resampled)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark training-set resampling methods")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated training row counts")
+    parser.add_argument("--configs", default="imblearn,smote,smote_float32,smote_capped,random,class_weight",
+                        help=f"Comma-separated cases: imblearn, {', '.join(CONFIGS)}")
+    parser.add_argument("--max_synthetic", type=int, default=50000, help="Generated-row cap for smote_capped")
+    parser.add_argument("--n_jobs", type=int, default=1, help="Threads for the SMOTE neighbour search")
+    args = parser.parse_args()
+
+    results = []
+    for n_rows in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        X, y = scaled_training_set(n_rows, seed=42)
+        for name in [c.strip() for c in args.configs.split(",") if c.strip()]:
+            timer = StageTimer(memory='tracemalloc')
+            with timer.stage(name):
+                if name == 'imblearn':
+                    _, _, report = imblearn_smote(X, y)
+                else:
+                    options = dict(CONFIGS[name], n_jobs=args.n_jobs)
+                    if name == 'smote_capped':
+                        options['max_synthetic'] = args.max_synthetic
+                    _, _, report = resample_training_set(X, y, **options)
+            record = timer.stages[name]
+            results.append({
+                'rows': n_rows,
+                'config': name,
+                'wall_s': record['wall_s'],
+                'cpu_s': record['cpu_s'],
+                'peak_mb': record['peak_mb'],
+                'output_mb': report['output_mb'],
+                'rows_after': report['rows_after']
+            })
+
+    print(json.dumps({'n_jobs': args.n_jobs, 'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Start-up time benchmark for the prediction CLI.
+
+Each case runs in a fresh interpreter (what /api/predict pays per request):
+  legacy_imports  - the module-level imports advanced_ml_trainer.py used to do,
+                    which every prediction process paid before the split
+  trainer_module  - import advanced_ml_trainer (training path, lazy shap/imblearn)
+  predictor_cli   - import run_predictor (prediction path, light module only)
+  predict_single  - full run_predictor.py single prediction (needs --models_dir)
+
+Prints JSON with min/median/max wall time per case.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+LEGACY_IMPORTS = (
+    "import pandas, numpy, joblib; "
+    "from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV, StratifiedKFold; "
+    "from sklearn.preprocessing import StandardScaler, LabelEncoder; "
+    "from sklearn.linear_model import LogisticRegression; "
+    "from sklearn.tree import DecisionTreeClassifier; "
+    "from sklearn.neighbors import KNeighborsClassifier; "
+    "from sklearn.svm import SVC; "
+    "from sklearn.ensemble import AdaBoostClassifier; "
+    "from xgboost import XGBClassifier; "
+    "from sklearn.metrics import accuracy_score; "
+    "from imblearn.over_sampling import SMOTE; "
+    "import shap"
+)
+
+SAMPLE_PARTICIPANT = {
+    "age": 25, "gender": "L", "grades": "S1", "majoring": "Computer Science",
+    "logical_test_score": 80, "tech_interview_grades": 85
+}
+
+
+def time_command(cmd, repeats):
+    """Run cmd repeats times in a fresh process and return wall times in seconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=SCRIPTS_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def heavy_modules_loaded(module):
+    """Which training-only packages end up in sys.modules after importing module"""
+    probe = (
+        f"import sys, {module}; "
+        "print(','.join(m for m in ('shap', 'imblearn', 'xgboost', 'sklearn.model_selection') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prediction CLI start-up time")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh-process runs per case")
+    parser.add_argument("--models_dir", default=None, help="Trained models dir; enables the predict_single case")
+    parser.add_argument("--models", default="logistic", help="Models for predict_single")
+    args = parser.parse_args()
+
+    cases = {
+        "legacy_imports": [sys.executable, "-c", LEGACY_IMPORTS],
+        "trainer_module": [sys.executable, "-c", "import advanced_ml_trainer"],
+        "predictor_cli": [sys.executable, "-c", "import run_predictor"],
+    }
+    if args.models_dir:
+        cases["predict_single"] = [
+            sys.executable, "run_predictor.py", "--models", args.models,
+            "--models_dir", os.path.abspath(args.models_dir),
+            "--participant", json.dumps(SAMPLE_PARTICIPANT)
+        ]
+
+    results = {"python": sys.version.split()[0], "repeats": args.repeats, "cases": {}}
+    for name, cmd in cases.items():
+        timings = time_command(cmd, args.repeats)
+        results["cases"][name] = {
+            "min_s": min(timings),
+            "median_s": statistics.median(timings),
+            "max_s": max(timings)
+        }
+    results["heavy_modules"] = {
+        "trainer_module": heavy_modules_loaded("advanced_ml_trainer"),
+        "predictor_cli": heavy_modules_loaded("run_predictor"),
+    }
+    legacy = results["cases"]["legacy_imports"]["median_s"]
+    cli = results["cases"]["predictor_cli"]["median_s"]
+    results["predictor_cli_speedup_vs_legacy"] = legacy / cli if cli > 0 else None
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+End-to-end training and inference benchmark across dataset sizes.
+
+For each size, generates synthetic participants (generate_synthetic_dataset),
+trains the selected algorithms with SMOTE and saved models, then loads the
+saved models for prediction. Reports per size:
+  training   - tuning, SHAP and total time per algorithm, resampling (SMOTE) time and peak memory
+               (from the stage timings training records, see advanced_ml_profiling)
+  single     - predict_new_data latency p50/p99 per algorithm and for all of them at once
+  batch      - predict_batch throughput in rows/sec and peak memory
+
+--compare takes an earlier output file and adds current/previous ratios for every
+timing, so runs on two commits can be diffed. Prints JSON (also written to --output).
+Large sizes are slow with grid search; --search_strategy random keeps them practical.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from advanced_ml_inference import BootcampInferencePredictor
+from advanced_ml_profiling import StageTimer
+from advanced_ml_trainer import (AdvancedMLBootcampPredictor, DEFAULT_SEARCH_ITER, generate_synthetic_dataset,
+                                 parse_search_strategy)
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def environment():
+    """What the numbers depend on besides the code: commit, interpreter, libraries, cores"""
+    import sklearn
+    import xgboost
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'xgboost': xgboost.__version__,
+        'cpu_count': os.cpu_count(),
+        'platform': platform.platform()
+    }
+
+
+def latency_summary(timings):
+    timings_ms = np.asarray(timings) * 1000
+    return {
+        'requests': len(timings_ms),
+        'p50_ms': float(np.percentile(timings_ms, 50)),
+        'p99_ms': float(np.percentile(timings_ms, 99)),
+        'mean_ms': float(timings_ms.mean())
+    }
+
+
+def stage_summary(record):
+    return {'wall_s': record['wall_s'], 'cpu_s': record['cpu_s'], 'peak_mb': record['peak_mb']} if record else None
+
+
+def benchmark_training(data_path, algorithms, models_dir, args):
+    """Train with SMOTE into models_dir; returns the training section of the report"""
+    trainer = AdvancedMLBootcampPredictor()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull  # trainer progress would drown the report
+        try:
+            results = trainer.train_and_evaluate_advanced(
+                data_path, 'class', algorithms, use_smote=True, save_dir=models_dir,
+                cpu_budget=args.cpu_budget, search_strategy=parse_search_strategy(args.search_strategy),
+                search_iter=args.search_iter, shap_budgets={'explain_rows': args.shap_rows},
+                memory_tracking=args.memory_tracking
+            )
+        finally:
+            sys.stdout = stdout
+    wall_s = time.perf_counter() - start
+    if 'error' in results:
+        raise RuntimeError(f"Training failed: {results['error']}")
+
+    timings = results['metadata']['timings']
+    per_algorithm = {}
+    for alg_id in algorithms:
+        stages = timings['algorithms'].get(alg_id, {})
+        per_algorithm[alg_id] = {
+            'tuning': stage_summary(stages.get('tuning')),
+            'shap': stage_summary(stages.get('shap')),
+            'shap_explainer': results[alg_id]['shap_stats']['explainer'],
+            'total': stage_summary(stages.get('total')),
+            'test_f1': results[alg_id]['metrics']['f1_score']
+        }
+    return {
+        'wall_s': wall_s,
+        'train_rows_after_smote': results['metadata']['train_shape'][0],
+        'preprocess': stage_summary(timings['stages'].get('preprocess')),
+        'resampling': stage_summary(timings['stages'].get('resampling')),
+        'training': stage_summary(timings['stages'].get('training')),
+        'algorithms': per_algorithm
+    }
+
+
+def benchmark_inference(df, algorithms, models_dir, args):
+    """Single-row latency and batch throughput against the models saved by benchmark_training"""
+    timer = StageTimer(memory=args.memory_tracking)
+    with timer.stage('load'):
+        predictor = BootcampInferencePredictor().load_artifacts(models_dir)
+        predictor.load_models(algorithms, models_dir)
+
+    records = df.head(max(args.latency_requests, args.warmup)).to_dict('records')
+    single = {}
+    for label, model_ids in [(alg_id, [alg_id]) for alg_id in algorithms] + [('all', algorithms)]:
+        for i in range(args.warmup):
+            predictor.predict_new_data(records[i % len(records)], model_ids, models_dir)
+        timings = []
+        with timer.stage('single', label):
+            for i in range(args.latency_requests):
+                start = time.perf_counter()
+                predictor.predict_new_data(records[i % len(records)], model_ids, models_dir)
+                timings.append(time.perf_counter() - start)
+        single[label] = latency_summary(timings)
+
+    batch_df = df.head(args.batch_rows) if args.batch_rows else df
+    with timer.stage('batch'):
+        start = time.perf_counter()
+        predictor.predict_batch(batch_df, algorithms, models_dir, output='columnar')
+        batch_s = time.perf_counter() - start
+    return {
+        'load': stage_summary(timer.stages['load']),
+        'single': single,
+        'single_peak_mb': max((r['single']['peak_mb'] or 0.0) for r in timer.algorithms.values()) if timer.memory else None,
+        'batch': {
+            'rows': len(batch_df),
+            'wall_s': batch_s,
+            'rows_per_s': len(batch_df) / batch_s if batch_s > 0 else None,
+            'peak_mb': timer.stages['batch']['peak_mb']
+        }
+    }
+
+
+def flatten_timings(report):
+    """{'<rows>/<path>': seconds or ms} for every timing in a report, for --compare"""
+    flat = {}
+
+    def walk(node, path):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                walk(value, f'{path}/{key}')
+        elif isinstance(node, (int, float)) and not isinstance(node, bool) and path.endswith(('_s', '_ms', 'rows_per_s')):
+            flat[path] = node
+
+    for entry in report['results']:
+        walk({k: v for k, v in entry.items() if k != 'rows'}, str(entry['rows']))
+    return flat
+
+
+def compare_reports(current, previous):
+    """current/previous ratio per timing present in both (>1 means slower, except rows_per_s)"""
+    now, before = flatten_timings(current), flatten_timings(previous)
+    return {
+        'previous_commit': previous.get('environment', {}).get('commit'),
+        'ratios': {path: now[path] / before[path] for path in now if before.get(path)}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark training and inference across dataset sizes")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000", help="Comma-separated dataset row counts")
+    parser.add_argument("--algorithms", default="logistic,decision_tree,adaboost,xgboost",
+                        help="Comma-separated algorithm ids (knn and svm scale poorly past ~100k rows)")
+    parser.add_argument("--search_strategy", default="grid", help="Hyperparameter search, as for the trainer CLIs")
+    parser.add_argument("--search_iter", type=int, default=DEFAULT_SEARCH_ITER, help="Candidates for random search")
+    parser.add_argument("--cpu_budget", type=int, default=None, help="Cores for concurrent tuning (default sequential)")
+    parser.add_argument("--shap_rows", type=int, default=100, help="Test rows explained with SHAP per model")
+    parser.add_argument("--latency_requests", type=int, default=200, help="Single predictions timed per model")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed single predictions before measuring")
+    parser.add_argument("--batch_rows", type=int, default=100000, help="Rows per batch prediction (0 = whole dataset)")
+    parser.add_argument("--memory_tracking", choices=["rss", "tracemalloc", "none"], default="rss",
+                        help="Peak memory measurement (see advanced_ml_profiling)")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic dataset seed")
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    parser.add_argument("--compare", default=None, help="Earlier report to compute timing ratios against")
+    args = parser.parse_args()
+    if args.memory_tracking == "none":
+        args.memory_tracking = None
+
+    algorithms = [a.strip() for a in args.algorithms.split(",") if a.strip()]
+    report = {
+        'environment': environment(),
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        'results': []
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in [int(s) for s in args.sizes.split(",") if s.strip()]:
+            df = generate_synthetic_dataset(n_rows, seed=args.seed)
+            data_path = os.path.join(tmp_dir, f'synthetic_{n_rows}.csv')
+            df.to_csv(data_path, index=False)
+            models_dir = os.path.join(tmp_dir, f'models_{n_rows}')
+            print(f"Benchmarking {n_rows} rows...", file=sys.stderr)
+            report['results'].append({
+                'rows': n_rows,
+                'training': benchmark_training(data_path, algorithms, models_dir, args),
+                'inference': benchmark_inference(df.drop(columns=['class']), algorithms, models_dir, args)
+            })
+
+    if args.compare:
+        with open(args.compare) as f:
+            report['comparison'] = compare_reports(report, json.load(f))
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
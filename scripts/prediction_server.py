@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Long-lived prediction server.
+
+Loads the preprocessing artifacts and every saved model once, then answers
+prediction requests over localhost HTTP with the same JSON that
+run_predictor.py prints, so /api/predict does not pay interpreter start-up,
+imports and joblib deserialization on every call.
+
+Endpoints:
+  GET  /health   -> {"status": "ok", "models": [...]}
+  POST /predict  -> body {"trained_models": [...], "participant_data": {...}}
+                    or   {"trained_models": [...], "csv_data": "<csv text>"}
+                    or   {"trained_models": [...], "rows": [{...}, ...]}
+                    batch requests may add "output": "columnar"; any request may add
+                    "explain": true for per-feature SHAP contributions
+  POST /reload   -> drop and reload every artifact of models_dir
+
+Artifacts live in a ModelRegistry, which also reloads any file whose mtime
+changed, so a retrain is picked up on the next request without /reload.
+"""
+import argparse
+import io
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from advanced_ml_inference import BootcampInferencePredictor, ModelRegistry, MMAP_MODE
+from run_predictor import predict_participant, predict_frame
+
+
+class PredictionService:
+    """Holds one warm predictor and swaps it atomically on reload"""
+
+    def __init__(self, models_dir, registry=None, n_jobs=1):
+        self.models_dir = models_dir
+        self.registry = registry or ModelRegistry()
+        self.n_jobs = n_jobs
+        self._lock = threading.Lock()
+        self.predictor = None
+        self.reload()
+
+    def reload(self):
+        """Build a fresh predictor with artifacts and all saved models loaded"""
+        self.registry.discard(self.models_dir)
+        predictor = BootcampInferencePredictor(model_registry=self.registry, n_jobs=self.n_jobs)
+        predictor.load_artifacts(self.models_dir)
+        predictor.load_models(predictor.available_models(self.models_dir), self.models_dir)
+        with self._lock:
+            self.predictor = predictor
+        return predictor.available_models(self.models_dir)
+
+    def predict(self, payload):
+        """Dispatch a /predict payload to single or batch prediction"""
+        predictor = self.predictor
+        model_ids = payload.get('trained_models') or payload.get('models') or []
+        if isinstance(model_ids, str):
+            model_ids = [m.strip() for m in model_ids.split(',') if m.strip()]
+        if not model_ids:
+            raise ValueError("trained_models must list at least one model ID")
+        # Batch responses: 'rows' (default, list of per-row dicts) or 'columnar' (per-model arrays)
+        output = payload.get('output', 'rows')
+        explain = bool(payload.get('explain', False))
+
+        if payload.get('csv_data'):
+            df = pd.read_csv(io.StringIO(payload['csv_data']))
+            return predict_frame(predictor, df, model_ids, self.models_dir, output=output, explain=explain)
+        if payload.get('rows'):
+            df = pd.DataFrame(payload['rows'])
+            return predict_frame(predictor, df, model_ids, self.models_dir, output=output, explain=explain)
+        participant = payload.get('participant_data') or payload.get('participant')
+        if participant:
+            return predict_participant(predictor, dict(participant), model_ids, self.models_dir, explain=explain)
+        raise ValueError("Either participant_data, csv_data or rows must be provided")
+
+
+def make_handler(service):
+    class PredictionHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send_json(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_json(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b''
+            return json.loads(raw or b'{}')
+
+        def do_GET(self):
+            if self.path == '/health':
+                models = service.predictor.available_models(service.models_dir)
+                self._send_json(200, {"status": "ok", "models": models, "registry": service.registry.stats()})
+            else:
+                self._send_json(404, {"error": "Not found", "success": False})
+
+        def do_POST(self):
+            try:
+                if self.path == '/predict':
+                    self._send_json(200, service.predict(self._read_json()))
+                elif self.path == '/reload':
+                    self._read_json()
+                    self._send_json(200, {"success": True, "models": service.reload()})
+                else:
+                    self._send_json(404, {"error": "Not found", "success": False})
+            except Exception as e:
+                self._send_json(500, {"error": str(e), "success": False})
+
+        def log_message(self, format, *args):
+            # Keep stdout clean; access log goes to stderr like the CLI wrappers
+            print(f"[prediction_server] {self.address_string()} {format % args}", file=sys.stderr)
+
+    return PredictionHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve predictions from warm, preloaded models")
+    parser.add_argument("--models_dir", default="saved_models", help="Directory containing saved models")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (keep on localhost)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--max_models", type=int, default=32, help="Max cached artifacts before LRU eviction")
+    parser.add_argument("--max_memory_mb", type=float, default=None, help="Max cached artifact size (MB) before LRU eviction")
+    parser.add_argument("--n_jobs", type=int, default=1, help="Threads per batch request for multi-model scoring (-1 = all cores)")
+    parser.add_argument("--no_mmap", action="store_true",
+                        help="Copy model arrays into process memory instead of memory-mapping the saved files")
+    args = parser.parse_args()
+
+    max_bytes = int(args.max_memory_mb * 1024 * 1024) if args.max_memory_mb else None
+    try:
+        service = PredictionService(args.models_dir, ModelRegistry(args.max_models, max_bytes, mmap_mode=None if args.no_mmap else MMAP_MODE), n_jobs=args.n_jobs)
+    except Exception as e:
+        print(json.dumps({"error": f"Failed to load model artifacts: {str(e)}. Please run training first."}))
+        sys.exit(1)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Prediction server listening on http://{args.host}:{args.port} "
+          f"(models: {', '.join(service.predictor.available_models(args.models_dir)) or 'none'})",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
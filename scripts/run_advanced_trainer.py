@@ -4,34 +4,99 @@ import json
 import sys
 import io
 import contextlib
-from advanced_ml_trainer import AdvancedMLBootcampPredictor
+from advanced_ml_explain import SHAP_BUDGETS
+from advanced_ml_ingest import DEFAULT_CHUNK_ROWS
+from advanced_ml_trainer import (CVScoreCache, DEFAULT_BOOTSTRAP_SAMPLES, DEFAULT_SEARCH_ITER, parse_search_strategy,
+                                 run_training_phases)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Run advanced ML trainer and print JSON results to stdout")
-    parser.add_argument("--data_path", required=True, help="Path to CSV dataset")
+    parser.add_argument("--data_path", required=True, help="Path to CSV or Parquet (.parquet, needs pyarrow) dataset")
     parser.add_argument("--target_column", default="class", help="Target column name")
     parser.add_argument("--algorithms", required=True, help="Comma-separated algorithm ids")
     parser.add_argument("--use_smote", action="store_true", help="Apply SMOTE on training set")
+    parser.add_argument("--cpu_budget", type=int, default=None,
+                        help="Total cores for training; tunes algorithms concurrently within this budget (-1 = all cores)")
+    parser.add_argument("--search_strategy", default="grid",
+                        help="Hyperparameter search: grid, random or halving, or per algorithm "
+                             "(e.g. svm=halving,xgboost=random; others use grid)")
+    parser.add_argument("--search_iter", type=int, default=DEFAULT_SEARCH_ITER,
+                        help="Candidates per algorithm for the random search strategy")
+    parser.add_argument("--sequential_phases", action="store_true",
+                        help="Run the baseline and SMOTE phases one after the other instead of in parallel worker processes "
+                             "(either way the dataset is preprocessed once and shared by both phases; "
+                             "parallel phases split --cpu_budget, or all cores, between them)")
+    parser.add_argument("--cv_cache_dir", default=None,
+                        help="Directory caching CV fold scores and best estimators across runs (default: no cache). "
+                             "Entries are pickles loaded back on later runs: only point this at a directory you trust")
+    parser.add_argument("--cv_cache_mb", type=float, default=512, help="Evict least recently used cache files above this size")
+    parser.add_argument("--shap_rows", type=int, default=SHAP_BUDGETS['explain_rows'],
+                        help="Test rows explained with SHAP per tree/linear model")
+    parser.add_argument("--shap_kernel_rows", type=int, default=SHAP_BUDGETS['kernel_explain_rows'],
+                        help="Test rows explained with kernel SHAP (KNN, SVM), the slow explainer")
+    parser.add_argument("--shap_background", type=int, default=SHAP_BUDGETS['background_rows'],
+                        help="k-means background size for kernel SHAP (KNN, SVM)")
+    parser.add_argument("--shap_jobs", type=int, default=SHAP_BUDGETS['n_jobs'], help="Workers for SHAP explanation chunks (-1 = all cores)")
+    parser.add_argument("--memory_tracking", choices=["rss", "tracemalloc", "none"], default="rss",
+                        help="Peak memory per training stage: process RSS high-water mark (cheap), "
+                             "tracemalloc allocations (slower) or none")
+    parser.add_argument("--profile_stage", default=None,
+                        help="Profile one stage with --profiler, e.g. resampling, shap or xgboost.tuning")
+    parser.add_argument("--profile_dir", default="profiles", help="Directory for --profile_stage output")
+    parser.add_argument("--profiler", choices=["cprofile", "pyinstrument"], default="cprofile",
+                        help="Profiler for --profile_stage: cProfile (.prof) or pyinstrument (.html, needs pyinstrument)")
+    parser.add_argument("--p_adjust", choices=["holm", "bonferroni", "fdr_bh", "none"], default="holm",
+                        help="Multiple-comparison adjustment of the pairwise McNemar p-values")
+    parser.add_argument("--bootstrap_samples", type=int, default=DEFAULT_BOOTSTRAP_SAMPLES,
+                        help="Test-set resamples for metric confidence intervals (0 disables)")
+    parser.add_argument("--chunk_rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="Rows of the dataset read and preprocessed at a time (bounds loading memory)")
+    parser.add_argument("--resampling", choices=["smote", "random", "class_weight"], default="smote",
+                        help="How the SMOTE phase rebalances the training set: SMOTE, random oversampling, "
+                             "or class weights instead of new rows")
+    parser.add_argument("--resample_dtype", choices=["float64", "float32"], default="float64",
+                        help="Precision of the resampled training matrix (float32 halves its memory)")
+    parser.add_argument("--max_synthetic", type=int, default=None, help="Cap on generated training rows (default: full balance)")
+    parser.add_argument("--resample_jobs", type=int, default=1, help="Threads for the SMOTE neighbour search (-1 = all cores)")
+    parser.add_argument("--resample_in_folds", action="store_true",
+                        help="Tune on CV folds resampled separately (once per fold) so validation folds hold no "
+                             "synthetic copies of their rows; the best models still train on the resampled set")
+    parser.add_argument("--knn_index", choices=["auto", "kd_tree", "ball_tree", "brute"], default="auto",
+                        help="Neighbor index the KNN model is saved with; auto times KD and ball trees over several leaf sizes")
+    parser.add_argument("--artifact_format", choices=["joblib", "mmap"], default="joblib",
+                        help="Saved model format: joblib pickles, or mmap (XGBoost native booster, memory-mapped arrays)")
     args = parser.parse_args()
 
     algos = [a.strip() for a in args.algorithms.split(",") if a.strip()]
+    search_strategy = parse_search_strategy(args.search_strategy)
+    cv_cache = CVScoreCache(args.cv_cache_dir, int(args.cv_cache_mb * 1024 * 1024)) if args.cv_cache_dir else None
 
-    predictor = AdvancedMLBootcampPredictor()
     log_buffer = io.StringIO()
     # Capture all prints from the trainer to avoid polluting stdout JSON
     with contextlib.redirect_stdout(log_buffer):
-        # 1. Run Baseline (No SMOTE)
-        print("--- Phase 1: Training Baseline Models (No SMOTE) ---")
-        baseline_results = predictor.train_and_evaluate_advanced(
-            args.data_path, args.target_column, algos, use_smote=False, save_dir=None
-        )
-        
-        # 2. Run SMOTE (Balanced) - Save these models
-        print("\n--- Phase 2: Training Balanced Models (SMOTE) ---")
-        smote_results = predictor.train_and_evaluate_advanced(
-            args.data_path, args.target_column, algos, use_smote=True, save_dir='saved_models'
+        # Phase 1 (baseline, no SMOTE) and Phase 2 (SMOTE, saved models) are independent jobs
+        phases = run_training_phases(
+            args.data_path, args.target_column, algos,
+            {
+                'baseline': {'header': "--- Phase 1: Training Baseline Models (No SMOTE) ---",
+                             'use_smote': False, 'save_dir': None},
+                'smote': {'header': "\n--- Phase 2: Training Balanced Models (SMOTE) ---",
+                          'use_smote': True, 'save_dir': 'saved_models'}
+            },
+            concurrent=not args.sequential_phases, cpu_budget=args.cpu_budget,
+            search_strategy=search_strategy, search_iter=args.search_iter, cv_cache=cv_cache,
+            shap_budgets={'explain_rows': args.shap_rows, 'kernel_explain_rows': args.shap_kernel_rows,
+                          'background_rows': args.shap_background, 'n_jobs': args.shap_jobs},
+            memory_tracking=None if args.memory_tracking == "none" else args.memory_tracking,
+            profile_stage=args.profile_stage, profile_dir=args.profile_dir, profiler=args.profiler,
+            artifact_format=args.artifact_format, knn_index=args.knn_index, p_adjust=args.p_adjust,
+            bootstrap_samples=args.bootstrap_samples, chunk_rows=args.chunk_rows,
+            resampling={'method': args.resampling, 'dtype': args.resample_dtype, 'max_synthetic': args.max_synthetic,
+                        'n_jobs': args.resample_jobs, 'in_folds': args.resample_in_folds}
         )
+        baseline_results = phases['baseline']
+        smote_results = phases['smote']
 
     # Construct Composite Result
     # We use smote_results as the primary response structure for backward compatibility
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+import io
+import contextlib
+from advanced_ml_explain import SHAP_BUDGETS
+from advanced_ml_ingest import DEFAULT_CHUNK_ROWS
+from advanced_ml_trainer import (AdvancedMLBootcampPredictor, INCREMENTAL_ALGORITHMS, INCREMENTAL_HOLDOUT,
+                                 INCREMENTAL_XGB_ROUNDS)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Update saved models with a new cohort (incremental training) and print JSON results to stdout"
+    )
+    parser.add_argument("--data_path", required=True, help="Path to CSV or Parquet (.parquet, needs pyarrow) cohort")
+    parser.add_argument("--target_column", default="class", help="Target column name")
+    parser.add_argument("--algorithms", default=",".join(INCREMENTAL_ALGORITHMS),
+                        help="Comma-separated algorithm ids (only logistic and xgboost train incrementally)")
+    parser.add_argument("--models_dir", default="saved_models", help="Directory with the models and preprocessor to update")
+    parser.add_argument("--chunk_rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows of the cohort read at a time")
+    parser.add_argument("--epochs", type=int, default=1, help="SGD passes over the cohort for logistic regression")
+    parser.add_argument("--xgb_rounds", type=int, default=INCREMENTAL_XGB_ROUNDS, help="Boosting rounds added to XGBoost")
+    parser.add_argument("--holdout", type=float, default=INCREMENTAL_HOLDOUT,
+                        help="Share of the cohort held out to score the models before and after the update")
+    parser.add_argument("--keep_worse", action="store_true",
+                        help="Save updated models even when their held-out F1 is below the saved model's")
+    parser.add_argument("--memory_tracking", choices=["rss", "tracemalloc", "none"], default="rss",
+                        help="Peak memory per stage: process RSS high-water mark (cheap), tracemalloc allocations (slower) or none")
+    parser.add_argument("--shap_background", type=int, default=SHAP_BUDGETS['linear_background_rows'],
+                        help="Cohort rows the rebuilt logistic SHAP explainer uses as background")
+    args = parser.parse_args()
+
+    algos = [a.strip() for a in args.algorithms.split(",") if a.strip()]
+
+    log_buffer = io.StringIO()
+    # Capture all prints from the trainer to avoid polluting stdout JSON
+    with contextlib.redirect_stdout(log_buffer):
+        results = AdvancedMLBootcampPredictor().update_saved_models(
+            args.data_path, args.target_column, algos, models_dir=args.models_dir,
+            chunk_rows=args.chunk_rows, epochs=args.epochs, xgb_rounds=args.xgb_rounds, holdout=args.holdout,
+            memory_tracking=None if args.memory_tracking == "none" else args.memory_tracking,
+            shap_budgets={'linear_background_rows': args.shap_background}, keep_worse=args.keep_worse
+        )
+
+    logs = log_buffer.getvalue()
+    if logs:
+        print(logs, file=sys.stderr, end="")
+
+    print(json.dumps(results, default=str))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
@@ -2,7 +2,83 @@
 import argparse
 import json
 import sys
-from advanced_ml_trainer import AdvancedMLBootcampPredictor
+from advanced_ml_inference import BootcampInferencePredictor, save_columnar
+
+# Column mapping for batch compatibility
+# Ensure names match model's expected features (Title Case usually)
+BATCH_COLUMN_MAP = {
+    'tech_interview_result': 'Tech Interview Result',
+    'education': 'Education',
+    'grades': 'Education', # Fallback
+    'logical_test_score': 'Logical Test Score',
+    'age': 'Age'
+}
+
+
+def normalize_participant(participant_data):
+    """Map single-prediction form keys onto the names the models were trained with"""
+    # Ensure keys match model expectations (Run mapping inside predict_new_data or here)
+    # The model likely expects 'Tech Interview Result' (Title Case) or 'tech_interview_result' depending on how it was trained.
+    # Based on generate_thesis_plots.py, features are: ['Logical Test Score', 'Tech Interview Result', 'Education_Num', 'Age']
+
+    # Simple mapper for single prediction entry compatibility
+    if 'tech_interview_result' in participant_data:
+        # Handle Pass/Fail -> 1.0/0.0 or keep as is if model expects string
+        val = participant_data['tech_interview_result']
+        if str(val).lower() == 'pass':
+            participant_data['Tech Interview Result'] = 1.0
+        elif str(val).lower() == 'fail' or str(val).lower() == 'failed':
+            participant_data['Tech Interview Result'] = 0.0
+        else:
+            # Fallback for numeric or other strings
+            try:
+                participant_data['Tech Interview Result'] = float(val)
+            except:
+                participant_data['Tech Interview Result'] = 0.0
+
+    if 'grades' in participant_data:
+         participant_data['Grades'] = participant_data['grades']
+    # Fallback/Aliases
+    if 'education' in participant_data and 'Grades' not in participant_data:
+         participant_data['Grades'] = participant_data['education']
+
+    if 'logical_test_score' in participant_data:
+         participant_data['Logical Test Score'] = float(participant_data['logical_test_score'])
+    if 'age' in participant_data:
+         participant_data['Age'] = int(participant_data['age'])
+    return participant_data
+
+
+def predict_participant(predictor, participant_data, model_ids, models_dir, explain=False):
+    """Build the single-prediction JSON response"""
+    participant_data = normalize_participant(participant_data)
+    predictions = predictor.predict_new_data(participant_data, model_ids, models_dir, explain=explain)
+
+    return {
+        "success": True,
+        "predictions": predictions,
+        "participant_summary": {
+            "logical_score": int(participant_data.get("Logical Test Score", 0)),
+            "tech_score": int(participant_data.get("Tech Interview Result", 0)),
+            "age": int(participant_data.get("Age", 0))
+        }
+    }
+
+
+def predict_frame(predictor, df, model_ids, models_dir, output='rows', explain=False):
+    """Build the batch-prediction JSON response for a DataFrame (output: 'rows' or 'columnar')"""
+    df = df.rename(columns=BATCH_COLUMN_MAP)
+
+    predictions = predictor.predict_batch(df, model_ids, models_dir, output=output, explain=explain)
+    return {
+        "success": True,
+        "batch_predictions": predictions,
+        "summary": {
+            "total_rows": len(df),
+            "columns": list(df.columns)
+        }
+    }
+
 
 def main():
     parser = argparse.ArgumentParser(description="Run prediction using saved models")
@@ -10,90 +86,91 @@ def main():
     parser.add_argument("--csv_file", required=False, help="Path to CSV file for batch prediction")
     parser.add_argument("--models", required=True, help="Comma-separated list of model IDs")
     parser.add_argument("--models_dir", default="saved_models", help="Directory containing saved models")
+    parser.add_argument("--output_format", default="rows", choices=["rows", "columnar", "ndjson", "npz", "arrow"],
+                        help="Batch output: rows (list of per-row dicts), columnar (per-model JSON arrays), "
+                             "ndjson (one JSON record per line), npz/arrow (arrays written to --output)")
+    parser.add_argument("--output", required=False, help="Output file for npz/arrow batch formats or --stream")
+    parser.add_argument("--stream", action="store_true",
+                        help="Score --csv_file in chunks and write results as they are produced (bounded memory)")
+    parser.add_argument("--stream_format", default="ndjson", choices=["ndjson", "csv"], help="Result format for --stream")
+    parser.add_argument("--chunksize", type=int, default=50000, help="Rows per chunk for --stream")
+    parser.add_argument("--n_jobs", type=int, default=1, help="Score models concurrently on this many workers (-1 = all cores)")
+    parser.add_argument("--shard_rows", type=int, default=None,
+                        help="Row shard size for parallel KNN/SVM scoring (default: auto, 0 = off)")
+    parser.add_argument("--parallel_backend", default="thread", choices=["thread", "process"],
+                        help="Worker pool type for --n_jobs")
+    parser.add_argument("--explain", action="store_true",
+                        help="Add per-feature SHAP contributions to every prediction (uses the saved explainers)")
     args = parser.parse_args()
 
     try:
         model_ids = [m.strip() for m in args.models.split(",") if m.strip()]
-        predictor = AdvancedMLBootcampPredictor()
-        
+        predictor = BootcampInferencePredictor(
+            n_jobs=args.n_jobs, shard_rows=args.shard_rows, parallel_backend=args.parallel_backend
+        )
+
         try:
             predictor.load_artifacts(args.models_dir)
         except Exception as e:
             print(json.dumps({"error": f"Failed to load model artifacts: {str(e)}. Please run training first."}))
             sys.exit(1)
-            
+
+        if args.csv_file and args.stream:
+            # Results go to --output (summary JSON on stdout) or straight to stdout (summary on stderr)
+            if args.output and args.output != "-":
+                with open(args.output, "w", newline="") as out:
+                    summary = predictor.predict_csv_stream(
+                        args.csv_file, model_ids, out, args.models_dir,
+                        chunksize=args.chunksize, fmt=args.stream_format, column_map=BATCH_COLUMN_MAP,
+                        explain=args.explain
+                    )
+                print(json.dumps({"success": True, "output_file": args.output,
+                                  "format": args.stream_format, "summary": summary}))
+            else:
+                summary = predictor.predict_csv_stream(
+                    args.csv_file, model_ids, sys.stdout, args.models_dir,
+                    chunksize=args.chunksize, fmt=args.stream_format, column_map=BATCH_COLUMN_MAP,
+                    explain=args.explain
+                )
+                print(json.dumps({"success": True, "format": args.stream_format, "summary": summary}), file=sys.stderr)
+            return
         if args.csv_file:
             import pandas as pd
             df = pd.read_csv(args.csv_file)
-            
-            # Column mapping for batch compatibility
-            # Ensure names match model's expected features (Title Case usually)
-            column_map = {
-                'tech_interview_result': 'Tech Interview Result',
-                'education': 'Education', 
-                'grades': 'Education', # Fallback
-                'logical_test_score': 'Logical Test Score',
-                'age': 'Age'
-            }
-            df = df.rename(columns=column_map)
-            
-            predictions = predictor.predict_batch(df, model_ids, args.models_dir)
-            result = {
-                "success": True,
-                "batch_predictions": predictions,
-                "summary": {
-                    "total_rows": len(df),
-                    "columns": list(df.columns)
+            if args.output_format == "ndjson":
+                # Stream per-row records instead of building one big JSON document
+                df = df.rename(columns=BATCH_COLUMN_MAP)
+                for row in predictor.iter_batch_records(df, model_ids, args.models_dir, explain=args.explain):
+                    sys.stdout.write(json.dumps(row) + "\n")
+                return
+            if args.output_format in ("npz", "arrow"):
+                if not args.output:
+                    raise ValueError(f"--output is required for --output_format {args.output_format}")
+                df = df.rename(columns=BATCH_COLUMN_MAP)
+                scores = predictor.score_batch(df, model_ids, args.models_dir, explain=args.explain)
+                arrays = save_columnar(scores, args.output, args.output_format)
+                result = {
+                    "success": True,
+                    "output_file": args.output,
+                    "format": args.output_format,
+                    "arrays": arrays,
+                    "errors": {alg_id: s["error"] for alg_id, s in scores.items() if "error" in s},
+                    "summary": {
+                        "total_rows": len(df),
+                        "columns": list(df.columns)
+                    }
                 }
-            }
+            else:
+                result = predict_frame(predictor, df, model_ids, args.models_dir, output=args.output_format,
+                                       explain=args.explain)
         elif args.participant:
             participant_data = json.loads(args.participant)
-            # Ensure keys match model expectations (Run mapping inside predict_new_data or here)
-            # The model likely expects 'Tech Interview Result' (Title Case) or 'tech_interview_result' depending on how it was trained.
-            # Based on generate_thesis_plots.py, features are: ['Logical Test Score', 'Tech Interview Result', 'Education_Num', 'Age']
-            
-            # Simple mapper for single prediction entry compatibility
-            if 'tech_interview_result' in participant_data:
-                # Handle Pass/Fail -> 1.0/0.0 or keep as is if model expects string
-                val = participant_data['tech_interview_result']
-                if str(val).lower() == 'pass':
-                    participant_data['Tech Interview Result'] = 1.0
-                elif str(val).lower() == 'fail' or str(val).lower() == 'failed':
-                    participant_data['Tech Interview Result'] = 0.0
-                else:
-                    # Fallback for numeric or other strings
-                    try:
-                        participant_data['Tech Interview Result'] = float(val)
-                    except:
-                        participant_data['Tech Interview Result'] = 0.0
-            
-            if 'grades' in participant_data:
-                 participant_data['Grades'] = participant_data['grades']
-            # Fallback/Aliases
-            if 'education' in participant_data and 'Grades' not in participant_data:
-                 participant_data['Grades'] = participant_data['education']
-                 
-            if 'logical_test_score' in participant_data:
-                 participant_data['Logical Test Score'] = float(participant_data['logical_test_score'])
-            if 'age' in participant_data:
-                 participant_data['Age'] = int(participant_data['age'])
-            
-            predictions = predictor.predict_new_data(participant_data, model_ids, args.models_dir)
-            
-            result = {
-                "success": True,
-                "predictions": predictions,
-                "participant_summary": {
-                    "logical_score": int(participant_data.get("Logical Test Score", 0)),
-                    "tech_score": int(participant_data.get("Tech Interview Result", 0)),
-                    "age": int(participant_data.get("Age", 0))
-                }
-            }
+            result = predict_participant(predictor, participant_data, model_ids, args.models_dir, explain=args.explain)
         else:
             raise ValueError("Either --participant or --csv_file must be provided")
-        
+
         print(json.dumps(result))
-        
+
     except Exception as e:
         print(json.dumps({"error": str(e), "success": False}))
         sys.exit(1)